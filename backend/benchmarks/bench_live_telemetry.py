@@ -0,0 +1,128 @@
+# Live Telemetry Benchmark
+# Concurrent WebSocket viewers on one flight, one publisher pushing samples
+#
+# Usage (from backend/):
+#   python -m benchmarks.bench_live_telemetry --viewers 100 --samples 500
+#
+# Prints a JSON report: fan-out latency percentiles (publisher send ->
+# viewer receive), publish throughput and per-viewer delivery counts.
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import uvicorn
+import websockets
+from fastapi import FastAPI
+
+from benchmarks.common import latency_summary
+from routers import flights
+
+
+async def start_server(port: int):
+    app = FastAPI()
+    app.include_router(flights.router, prefix="/api/flights")
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def viewer(url: str, expected: int, sent_at: dict, latencies: list, timeout: float) -> int:
+    received = 0
+    async with websockets.connect(url, max_queue=None) as ws:
+        await ws.recv()  # snapshot
+        try:
+            while received < expected:
+                message = json.loads(await asyncio.wait_for(ws.recv(), timeout))
+                if message["type"] != "sample":
+                    continue
+                received += 1
+                started = sent_at.get(message["data_point"]["timestamp"])
+                if started is not None:
+                    latencies.append((time.perf_counter() - started) * 1000)
+        except asyncio.TimeoutError:
+            pass
+    return received
+
+
+async def run(args) -> dict:
+    server, server_task = await start_server(args.port)
+    base = f"127.0.0.1:{args.port}/api/flights"
+
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"http://{base}/", json={
+            "aircraft_type": "C172",
+            "departure_time": datetime.now().isoformat()
+        })
+        flight_id = response.json()["id"]
+
+    url = f"ws://{base}/{flight_id}/live"
+    sent_at: dict = {}
+    latencies: list = []
+
+    viewers = [
+        asyncio.create_task(viewer(url, args.samples, sent_at, latencies, args.timeout))
+        for _ in range(args.viewers)
+    ]
+    while flights.telemetry_hub.viewer_count(flight_id) < args.viewers:
+        await asyncio.sleep(0.05)
+
+    start = datetime(2026, 1, 1)
+    interval = 1 / args.rate if args.rate else 0
+    publish_started = time.perf_counter()
+
+    async with websockets.connect(url) as publisher:
+        await publisher.recv()  # snapshot
+        for i in range(args.samples):
+            timestamp = (start + timedelta(seconds=i)).isoformat()
+            sent_at[timestamp] = time.perf_counter()
+            await publisher.send(json.dumps({
+                "type": "sample",
+                "data": {
+                    "timestamp": timestamp,
+                    "oil_pressure": 55.0,
+                    "oil_temperature": 190.0,
+                    "cht": 360.0 + (i % 20),
+                    "egt": 1360.0,
+                    "rpm": 2400.0,
+                    "fuel_quantity": 40.0 - i * 0.01
+                }
+            }))
+            if interval:
+                await asyncio.sleep(interval)
+        publish_seconds = time.perf_counter() - publish_started
+        received = await asyncio.gather(*viewers)
+
+    server.should_exit = True
+    await server_task
+
+    return {
+        "viewers": args.viewers,
+        "samples": args.samples,
+        "publish_rate_per_s": round(args.samples / publish_seconds, 1),
+        "deliveries": sum(received),
+        "expected_deliveries": args.viewers * args.samples,
+        "min_received_per_viewer": min(received),
+        "latency_ms": latency_summary(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark live telemetry fan-out")
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=0, help="Samples per second (0 = as fast as possible)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Viewer idle timeout in seconds")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
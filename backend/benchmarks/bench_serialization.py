@@ -0,0 +1,165 @@
+# Serialization Benchmark
+# Default FastAPI JSON path vs orjson + skipped re-validation + compression
+#
+# Usage (from backend/):
+#   python -m benchmarks.bench_serialization --points 10000 --iterations 50
+#
+# Loads one flight with N engine data points through the real API, then
+# times the same payloads served two ways, in-process (no network):
+#   before: handler returns a dict -> response_model validation ->
+#           jsonable_encoder -> json.dumps, uncompressed
+#   after:  the flights router as shipped (FastJSONResponse) behind
+#           CompressionMiddleware, with identity / gzip / br negotiation
+# Prints a JSON report of latency and bytes on the wire per variant.
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import httpx
+from fastapi import APIRouter, FastAPI, HTTPException
+
+from benchmarks.common import latency_summary
+from routers import flights
+from routers.flights import EngineAlertResponse
+from services import responses
+from services.responses import CompressionMiddleware
+
+# The original handlers, kept here as the "before" baseline
+baseline = APIRouter()
+
+
+@baseline.get("/{flight_id}/engine-data")
+async def baseline_engine_data(flight_id: str):
+    if flight_id not in flights.flights_db:
+        raise HTTPException(status_code=404, detail="Flight not found")
+    return {"flight_id": flight_id, "data_points": flights.engine_data_db.get(flight_id, [])}
+
+
+@baseline.get("/{flight_id}/alerts", response_model=List[EngineAlertResponse])
+async def baseline_alerts(flight_id: str):
+    if flight_id not in flights.flights_db:
+        raise HTTPException(status_code=404, detail="Flight not found")
+    return list(flights.engine_alerts_db.get(flight_id, ()))
+
+
+@baseline.get("/")
+async def baseline_flights(user_id: str, limit: int = 20):
+    user_flights = [f for f in flights.flights_db.values() if f["user_id"] == user_id]
+    return {"flights": user_flights[:limit], "total": len(user_flights)}
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(flights.router, prefix="/api/flights")
+    app.include_router(baseline, prefix="/baseline/flights")
+    app.add_middleware(CompressionMiddleware)
+    return app
+
+
+def engine_points(count: int) -> List[dict]:
+    """A long flight at 1 Hz: slow random walks, with occasional CHT spikes so alerts exist"""
+    started = datetime.now() - timedelta(seconds=count)
+    values = {"oil_pressure": 55.0, "oil_temperature": 190.0, "cht": 365.0, "egt": 1365.0, "rpm": 2400.0}
+    steps = {"oil_pressure": 0.05, "oil_temperature": 0.1, "cht": 0.2, "egt": 0.5, "rpm": 1.0}
+    points = []
+    for i in range(count):
+        for name, step in steps.items():
+            values[name] += random.uniform(-step, step)
+        point = {name: round(value, 2) for name, value in values.items()}
+        if i % 1000 == 999:
+            point["cht"] = 510.0
+        point["timestamp"] = (started + timedelta(seconds=i)).isoformat()
+        point["fuel_quantity"] = round(40 - i * 0.002, 3)
+        points.append(point)
+    return points
+
+
+async def measure(client: httpx.AsyncClient, path: str, encoding: str, iterations: int) -> dict:
+    latencies = []
+    wire_bytes = body_bytes = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await client.get(path, headers={"Accept-Encoding": encoding})
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        wire_bytes = response.num_bytes_downloaded
+        body_bytes = len(response.content)
+    return {
+        "content_encoding": response.headers.get("content-encoding", "identity"),
+        "wire_bytes": wire_bytes,
+        "decoded_bytes": body_bytes,
+        "latency_ms": latency_summary(latencies)
+    }
+
+
+async def run(args) -> dict:
+    random.seed(args.seed)
+    transport = httpx.ASGITransport(app=build_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for _ in range(args.flights):
+            response = await client.post("/api/flights/", json={
+                "departure_airport": "KAUS",
+                "arrival_airport": "KSAT",
+                "aircraft_type": "C172",
+                "departure_time": datetime.now().isoformat()
+            })
+            flight_id = response.json()["id"]
+
+        points = engine_points(args.points)
+        for i in range(0, len(points), 1000):
+            response = await client.post(f"/api/flights/{flight_id}/engine-data/bulk", json=points[i:i + 1000])
+            response.raise_for_status()
+
+        encodings = ["identity", "gzip"] + (["br"] if responses.brotli is not None else [])
+        payloads = {
+            "engine_data": (f"/baseline/flights/{flight_id}/engine-data", f"/api/flights/{flight_id}/engine-data"),
+            "alerts": (f"/baseline/flights/{flight_id}/alerts", f"/api/flights/{flight_id}/alerts"),
+            "flight_list": ("/baseline/flights/?user_id=mock_user_id&limit=1000",
+                            "/api/flights/?user_id=mock_user_id&limit=1000"),
+        }
+
+        report = {
+            "config": {
+                "points": args.points,
+                "flights": args.flights,
+                "iterations": args.iterations,
+                "orjson": responses.orjson is not None,
+                "brotli": responses.brotli is not None
+            },
+            "payloads": {}
+        }
+        for name, (before_path, after_path) in payloads.items():
+            result = {"before": await measure(client, before_path, "identity", args.iterations)}
+            for encoding in encodings:
+                result[f"after_{encoding}"] = await measure(client, after_path, encoding, args.iterations)
+            report["payloads"][name] = result
+
+        export = {}
+        for export_format in ("columnar", "csv"):
+            path = f"/api/flights/{flight_id}/export?format={export_format}"
+            for encoding in encodings:
+                export[f"{export_format}_{encoding}"] = await measure(client, path, encoding, args.iterations)
+        report["payloads"]["export"] = export
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON serialization paths for large payloads")
+    parser.add_argument("--points", type=int, default=10000, help="Engine data points on the flight")
+    parser.add_argument("--flights", type=int, default=200, help="Flights in the list endpoint")
+    parser.add_argument("--iterations", type=int, default=30, help="Requests per variant")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
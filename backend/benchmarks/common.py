@@ -0,0 +1,36 @@
+# Benchmark Helpers
+# Shared latency statistics for benchmark reports
+
+import socket
+import statistics
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for an empty sample)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/mean/max of latencies in milliseconds"""
+    def rounded(value):
+        return None if value is None else round(value, 2)
+
+    return {
+        "p50": rounded(percentile(values, 50)),
+        "p95": rounded(percentile(values, 95)),
+        "p99": rounded(percentile(values, 99)),
+        "mean": rounded(statistics.fmean(values)) if values else None,
+        "max": rounded(max(values)) if values else None
+    }
+
+
+def free_port() -> int:
+    """Ask the OS for an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,136 @@
+# Fake Upstreams
+# Local stand-ins for aviationweather.gov, the OpenAI chat API and Apple JWKS
+#
+# Latency and error rates are configurable so load tests can reproduce slow
+# or flaky upstreams without touching the real services (or paying for GPT-4).
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Optional
+
+from aiohttp import web
+
+FAKE_ANALYSIS = {
+    "recommendation": "GO",
+    "reasoning": "VFR conditions at departure and arrival; winds within C172 crosswind limits.",
+    "weather_summary": "Clear skies, 10SM visibility, light southerly winds.",
+    "hazards": [],
+    "alternatives": ["Recheck METARs before departure"],
+    "confidence": "High"
+}
+
+FAKE_COACHING_ANSWER = (
+    "For a C172, plan a descent of about 500 fpm to keep passengers comfortable "
+    "and avoid shock cooling. Always check your POH."
+)
+
+
+class UpstreamProfile:
+    """Latency and error injection for one fake upstream"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    async def delay(self):
+        latency = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+class FakeUpstreams:
+    """aiohttp app serving the fake NOAA, OpenAI and Apple endpoints"""
+
+    def __init__(
+        self,
+        noaa: Optional[UpstreamProfile] = None,
+        openai: Optional[UpstreamProfile] = None
+    ):
+        self.noaa = noaa or UpstreamProfile()
+        self.openai = openai or UpstreamProfile()
+        self.calls: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/api/data/metar", self.metar)
+        self.app.router.add_get("/api/data/taf", self.taf)
+        self.app.router.add_post("/v1/chat/completions", self.chat_completions)
+        self.app.router.add_get("/auth/keys", self.apple_keys)
+
+    async def start(self, host: str, port: int) -> str:
+        """Start serving; returns the base URL"""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def metar(self, request: web.Request) -> web.Response:
+        self.calls["noaa_metar"] += 1
+        await self.noaa.delay()
+        if self.noaa.should_fail():
+            self.calls["noaa_metar_errors"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        # One line per station, like NOAA does for comma-separated ids
+        airports = request.query.get("ids", "KAUS").split(",")
+        return web.Response(text="".join(
+            f"{airport} 151853Z 18008KT 10SM FEW045 28/16 A3001 RMK AO2\n" for airport in airports
+        ))
+
+    async def taf(self, request: web.Request) -> web.Response:
+        self.calls["noaa_taf"] += 1
+        await self.noaa.delay()
+        if self.noaa.should_fail():
+            self.calls["noaa_taf_errors"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        airport = request.query.get("ids", "KAUS")
+        return web.Response(text=f"TAF {airport} 151720Z 1518/1618 18010KT P6SM FEW050\n")
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        self.calls["openai_chat"] += 1
+        body = await request.json()
+        await self.openai.delay()
+        if self.openai.should_fail():
+            self.calls["openai_chat_errors"] += 1
+            return web.json_response(
+                {"error": {"message": "Injected upstream error", "type": "server_error"}},
+                status=500
+            )
+
+        wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+        content = json.dumps(FAKE_ANALYSIS) if wants_json else FAKE_COACHING_ANSWER
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+        completion_tokens = len(content) // 4
+
+        return web.json_response({
+            "id": f"chatcmpl-bench{self.calls['openai_chat']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4-turbo-preview"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    async def apple_keys(self, request: web.Request) -> web.Response:
+        self.calls["apple_keys"] += 1
+        return web.json_response({"keys": []})
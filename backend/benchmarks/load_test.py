@@ -0,0 +1,346 @@
+# Load Test
+# Drives a realistic traffic mix against the full backend with local upstreams
+# Requirement: Dustin's Feature #2 - weather analysis response time <3 seconds
+#
+# Usage (from backend/):
+#   python -m benchmarks.load_test --duration 30 --concurrency 20 --output run.json
+#   python -m benchmarks.load_test --openai-latency-ms 1500 --openai-error-rate 0.05
+#   python -m benchmarks.load_test --baseline run.json   # exit 1 on p95 regressions
+#
+# The backend runs as a uvicorn subprocess pointed at fake NOAA / OpenAI /
+# Apple servers (benchmarks/fake_upstreams.py), so no real API keys or
+# network access are needed. The report is JSON: per-operation latency
+# percentiles, throughput and upstream call counts.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from benchmarks.common import latency_summary, free_port
+from benchmarks.fake_upstreams import FakeUpstreams, UpstreamProfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = "127.0.0.1"
+JWT_SECRET = "benchmark-secret"
+
+DEFAULT_MIX = "weather=2,chat=2,flight=1,engine=4,engine_read=1"
+
+AIRPORTS = [
+    "KAUS", "KSAT", "KDFW", "KIAH", "KHOU", "KELP", "KLBB", "KAMA", "KMAF", "KCRP",
+    "KBRO", "KACT", "KGRK", "KTYR", "KSJT", "KABI", "KGGG", "KBPT", "KHRL", "KGTU"
+]
+
+# Canned /chat reply when OpenAI fails (routers.coaching.COACHING_FALLBACK). It
+# comes back as a 200, so the harness counts it as a "fallback" error itself.
+CHAT_FALLBACK = "I'm experiencing technical difficulties. Please try again in a moment."
+
+CHAT_QUESTIONS = [
+    "What's the best descent rate for a C172?",
+    "How do I recognize carburetor icing?",
+    "What are VFR cloud clearance requirements in Class E?",
+    "How should I brief a short-field landing?"
+]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+# --- Operations --------------------------------------------------------------
+
+async def op_weather(client: httpx.AsyncClient, state: Dict[str, Any]) -> httpx.Response:
+    departure, arrival = random.sample(AIRPORTS, 2)
+    return await client.post("/api/coaching/weather-analysis", json={
+        "departure_airport": departure,
+        "arrival_airport": arrival,
+        # Somewhere over central Texas, so enroute station lookup is exercised
+        "current_position": {"lat": random.uniform(29.5, 32.5), "lon": random.uniform(-99.5, -96.5)},
+        "fuel_remaining": 30.5,
+        "pilot_experience_hours": 150,
+        "aircraft_type": "C172",
+        "custom_question": "Should I fly this route today?"
+    })
+
+
+async def op_chat(client: httpx.AsyncClient, state: Dict[str, Any]) -> httpx.Response:
+    return await client.post("/api/coaching/chat", json={
+        "user_id": "bench-user",
+        "message": random.choice(CHAT_QUESTIONS)
+    })
+
+
+async def op_flight(client: httpx.AsyncClient, state: Dict[str, Any]) -> httpx.Response:
+    response = await client.post("/api/flights/", json={
+        "departure_airport": random.choice(AIRPORTS),
+        "arrival_airport": random.choice(AIRPORTS),
+        "aircraft_type": "C172",
+        "departure_time": datetime.now().isoformat()
+    })
+    if response.status_code == 200:
+        state["flights"].append(response.json()["id"])
+    return response
+
+
+async def op_engine(client: httpx.AsyncClient, state: Dict[str, Any]) -> Optional[httpx.Response]:
+    if not state["flights"]:
+        return None
+    return await client.post(f"/api/flights/{random.choice(state['flights'])}/engine-data", json={
+        "oil_pressure": random.uniform(50, 60),
+        "oil_temperature": random.uniform(180, 200),
+        "cht": random.uniform(340, 390),
+        "egt": random.uniform(1340, 1390),
+        "rpm": random.uniform(2350, 2450),
+        "fuel_quantity": random.uniform(20, 40)
+    })
+
+
+async def op_engine_read(client: httpx.AsyncClient, state: Dict[str, Any]) -> Optional[httpx.Response]:
+    if not state["flights"]:
+        return None
+    return await client.get(f"/api/flights/{random.choice(state['flights'])}/engine-data")
+
+
+async def op_trends(client: httpx.AsyncClient, state: Dict[str, Any]) -> Optional[httpx.Response]:
+    if not state["flights"]:
+        return None
+    return await client.get(f"/api/flights/{random.choice(state['flights'])}/trends")
+
+
+OPERATIONS = {
+    "weather": op_weather,
+    "chat": op_chat,
+    "flight": op_flight,
+    "engine": op_engine,
+    "engine_read": op_engine_read,
+    "trends": op_trends,
+}
+
+
+# --- Harness -----------------------------------------------------------------
+
+async def start_backend(port: int, upstream_url: str, store_dir: str) -> asyncio.subprocess.Process:
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="sk-benchmark",
+        OPENAI_BASE_URL=f"{upstream_url}/v1",
+        AVIATION_WEATHER_API_URL=f"{upstream_url}/api/data",
+        APPLE_KEYS_URL=f"{upstream_url}/auth/keys",
+        JWT_SECRET=JWT_SECRET,
+        AI_USAGE_STORE_PATH=os.path.join(store_dir, "ai_usage.json"),
+    )
+    env.pop("REDIS_URL", None)
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", HOST, "--port", str(port), "--log-level", "warning",
+        cwd=BACKEND_DIR, env=env
+    )
+
+    async with httpx.AsyncClient() as client:
+        for _ in range(300):
+            if process.returncode is not None:
+                raise RuntimeError("Backend exited during startup")
+            try:
+                if (await client.get(f"http://{HOST}:{port}/health")).status_code == 200:
+                    return process
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("Backend did not become healthy within 30 seconds")
+
+
+def bench_access_token() -> str:
+    """Ultimate-tier token so AI quotas don't throttle the run"""
+    sys.path.insert(0, BACKEND_DIR)
+    from services.auth_service import AuthService
+    return AuthService(secret=JWT_SECRET).issue_tokens("bench-user", "ultimate")["access_token"]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    state: Dict[str, Any],
+    weights: Dict[str, float],
+    deadline: float,
+    results: Dict[str, List]
+):
+    names, values = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        name = random.choices(names, values)[0]
+        started = time.perf_counter()
+        try:
+            response = await OPERATIONS[name](client, state)
+            if response is None:
+                # Needs a flight and none exist yet (e.g. every setup create failed)
+                await asyncio.sleep(0)
+                continue
+            status = response.status_code
+            if name == "chat" and status == 200 and response.json().get("response") == CHAT_FALLBACK:
+                status = "fallback"
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results[name].append(((time.perf_counter() - started) * 1000, status))
+
+
+def build_report(args, results: Dict[str, List], elapsed: float, upstream_calls: Dict[str, int]) -> Dict[str, Any]:
+    operations = {}
+    all_latencies = []
+    total_errors = 0
+
+    for name, samples in sorted(results.items()):
+        latencies = [latency for latency, _ in samples]
+        status_codes = defaultdict(int)
+        for _, status in samples:
+            status_codes[str(status)] += 1
+        errors = sum(1 for _, status in samples if not isinstance(status, int) or status >= 400)
+
+        operations[name] = {
+            "count": len(samples),
+            "errors": errors,
+            "status_codes": dict(status_codes),
+            "latency_ms": latency_summary(latencies)
+        }
+        all_latencies.extend(latencies)
+        total_errors += errors
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "noaa": {"latency_ms": args.noaa_latency_ms, "error_rate": args.noaa_error_rate},
+            "openai": {"latency_ms": args.openai_latency_ms, "error_rate": args.openai_error_rate},
+            "jitter_ms": args.jitter_ms
+        },
+        "elapsed_s": round(elapsed, 2),
+        "requests": len(all_latencies),
+        "errors": total_errors,
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        "latency_ms": latency_summary(all_latencies),
+        "operations": operations,
+        "upstream_calls": dict(upstream_calls)
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold_pct: float) -> Dict[str, Any]:
+    """p95 and throughput deltas against a previous run"""
+    deltas = {}
+    regressions = []
+
+    for name, current in report["operations"].items():
+        previous = baseline.get("operations", {}).get(name)
+        if not previous:
+            continue
+        old_p95, new_p95 = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if not old_p95 or new_p95 is None:
+            continue
+        change = (new_p95 - old_p95) / old_p95 * 100
+        deltas[name] = {"p95_before": old_p95, "p95_after": new_p95, "p95_change_pct": round(change, 1)}
+        if change > threshold_pct:
+            regressions.append(name)
+
+    old_rps = baseline.get("throughput_rps")
+    throughput_change = round((report["throughput_rps"] - old_rps) / old_rps * 100, 1) if old_rps else None
+    if throughput_change is not None and throughput_change < -threshold_pct:
+        regressions.append("throughput")
+
+    return {"operations": deltas, "throughput_change_pct": throughput_change, "regressions": regressions}
+
+
+async def run(args) -> Dict[str, Any]:
+    weights = parse_mix(args.mix)
+
+    upstreams = FakeUpstreams(
+        noaa=UpstreamProfile(args.noaa_latency_ms, args.jitter_ms, args.noaa_error_rate),
+        openai=UpstreamProfile(args.openai_latency_ms, args.jitter_ms, args.openai_error_rate)
+    )
+    upstream_url = await upstreams.start(HOST, free_port())
+    port = free_port()
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        backend = await start_backend(port, upstream_url, store_dir)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            headers = {"Authorization": f"Bearer {bench_access_token()}"}
+
+            async with httpx.AsyncClient(
+                base_url=f"http://{HOST}:{port}", headers=headers, limits=limits, timeout=30
+            ) as client:
+                state = {"flights": []}
+                for _ in range(max(1, args.concurrency // 2)):
+                    await op_flight(client, state)
+                if not state["flights"]:
+                    print("⚠️ No flights created during setup; engine operations wait for the flight op",
+                          file=sys.stderr)
+
+                # Startup traffic (key validation, JWKS fetch) is not part of the run
+                upstreams.calls.clear()
+                results: Dict[str, List] = defaultdict(list)
+                started = time.perf_counter()
+                deadline = started + args.duration
+
+                await asyncio.gather(*[
+                    worker(client, state, weights, deadline, results)
+                    for _ in range(args.concurrency)
+                ])
+                elapsed = time.perf_counter() - started
+        finally:
+            backend.terminate()
+            await backend.wait()
+            await upstreams.stop()
+
+    return build_report(args, results, elapsed, upstreams.calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Guardian One backend against local upstreams")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights ({', '.join(OPERATIONS)})")
+    parser.add_argument("--noaa-latency-ms", type=float, default=150)
+    parser.add_argument("--noaa-error-rate", type=float, default=0.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=1200)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--regression-threshold", type=float, default=10.0,
+                        help="Percent p95/throughput change treated as a regression")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f), args.regression_threshold)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+    if report.get("comparison", {}).get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
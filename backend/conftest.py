@@ -0,0 +1,12 @@
+# Pytest configuration for the backend
+# Flat imports (services.*, routers.*) resolve from backend/, as when running main.py
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Benchmarks are run as scripts (python -m benchmarks.load_test), not collected as tests
+collect_ignore = ["benchmarks"]
@@ -8,35 +8,48 @@ load_dotenv()  # Load environment variables from .env file
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 import uvicorn
 from routers import coaching, flights, auth
 from services.openai_service import OpenAIService
+from services.metrics import metrics, MetricsMiddleware, TimedRoute
+from services.logging_setup import setup_logging
+from services.responses import CompressionMiddleware
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (JSON, written by a background thread)
+log_listener = setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup (the log writer may have been stopped by a previous shutdown)
+    log_listener.start()
     logger.info("🚀 Guardian One Backend starting...")
 
     # Initialize OpenAI service
     openai_service = OpenAIService()
     await openai_service.validate_api_key()
 
+    # Load AI usage counters and start background flushing
+    await coaching.quota_service.start()
+
+    # Fetch Apple Sign-In keys and keep them refreshed in the background
+    await auth.auth_service.apple_keys.start()
+
     logger.info("✅ Backend ready")
 
     yield
 
     # Shutdown
     logger.info("⏸️ Backend shutting down...")
+    await auth.auth_service.apple_keys.stop()
+    await coaching.quota_service.stop()
+
+    # Flush queued log records
+    log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
@@ -45,6 +58,7 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+app.router.route_class = TimedRoute
 
 # CORS middleware (allow iOS app connections)
 app.add_middleware(
@@ -55,6 +69,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for large bodies (engine data dumps, exports)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency histograms (added last = outermost, so it times the full request)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(coaching.router, prefix="/api/coaching", tags=["AI Coaching"])
@@ -70,6 +90,12 @@ async def health_check():
         "version": "1.0.0"
     }
 
+# Prometheus metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Latency histograms and counters in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -88,5 +114,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8002,
         reload=True,
-        log_level="info"
+        log_level="info",
+        log_config=None  # Keep the queue-backed logging configured above
     )
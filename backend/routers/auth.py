@@ -1,12 +1,19 @@
 # Authentication Router
 # Apple Sign-In and JWT token management
 # Built by Byte (Backend Agent) - Day 3
-# TODO: Implement full Apple Sign-In flow
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from uuid import uuid4
+from services.auth_service import AuthService, AuthError
+from services.metrics import TimedRoute
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=TimedRoute)
 
 class AppleSignInRequest(BaseModel):
     """Apple Sign-In request"""
@@ -17,36 +24,124 @@ class AppleSignInRequest(BaseModel):
 class AuthResponse(BaseModel):
     """Authentication response"""
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    expires_in: int
     user_id: str
     subscription_tier: str
 
+class RefreshRequest(BaseModel):
+    """Token refresh request"""
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    """Logout request (refresh token is revoked too when provided)"""
+    refresh_token: Optional[str] = None
+
+auth_service = AuthService()
+
+# In-memory users for M2 demo (replace with Supabase users table)
+# Apple user identifier -> user record
+users_db = {}
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Dict[str, Any]:
+    """
+    Require a valid access token
+
+    Returns:
+        Token claims (sub = user ID, tier = subscription tier)
+    """
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    try:
+        return auth_service.verify_token(credentials.credentials)
+    except AuthError as e:
+        raise _unauthorized(str(e))
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[Dict[str, Any]]:
+    """Like get_current_user, but anonymous requests get None (bad tokens still fail)"""
+    if credentials is None:
+        return None
+    return await get_current_user(credentials)
+
 @router.post("/apple-signin", response_model=AuthResponse)
 async def apple_signin(request: AppleSignInRequest):
     """
     Apple Sign-In endpoint
 
-    TODO (Day 3):
-    - Verify Apple identity token
-    - Create or update user in Supabase
-    - Generate JWT access token
-    - Return user profile and subscription tier
+    Verifies the Apple identity token, creates the user on first sign-in and
+    returns Guardian One access/refresh tokens.
+
+    TODO: Store users in Supabase instead of memory
     """
-    # Mock response for M2 development
+    try:
+        apple_claims = await auth_service.verify_apple_token(request.identity_token)
+    except AuthError as e:
+        logger.warning("⚠️ Apple Sign-In rejected: %s", e)
+        raise _unauthorized(str(e))
+
+    if apple_claims.get("sub") != request.user_identifier:
+        raise _unauthorized("Identity token does not match user identifier")
+
+    user = users_db.get(apple_claims["sub"])
+    if user is None:
+        user = {
+            "user_id": str(uuid4()),
+            "apple_id": apple_claims["sub"],
+            "email": apple_claims.get("email"),
+            "subscription_tier": "free"
+        }
+        users_db[apple_claims["sub"]] = user
+        logger.info("👤 New user created: %s", user["user_id"])
+
+    tokens = auth_service.issue_tokens(user["user_id"], user["subscription_tier"])
+
     return AuthResponse(
-        access_token="mock_jwt_token_for_development",
-        user_id="mock_user_id",
-        subscription_tier="free"
+        **tokens,
+        user_id=user["user_id"],
+        subscription_tier=user["subscription_tier"]
     )
 
-@router.post("/refresh")
-async def refresh_token(refresh_token: str):
-    """Refresh JWT access token"""
-    # TODO: Implement JWT refresh logic
-    raise HTTPException(status_code=501, detail="Not implemented yet")
+@router.post("/refresh", response_model=AuthResponse)
+async def refresh_token(request: RefreshRequest):
+    """Exchange a refresh token for a new token pair (the old refresh token is revoked)"""
+    try:
+        claims = auth_service.verify_token(request.refresh_token, token_type="refresh")
+    except AuthError as e:
+        raise _unauthorized(str(e))
+
+    auth_service.revoke(claims)
+    tokens = auth_service.issue_tokens(claims["sub"], claims["tier"])
+
+    return AuthResponse(
+        **tokens,
+        user_id=claims["sub"],
+        subscription_tier=claims["tier"]
+    )
 
 @router.post("/logout")
-async def logout(access_token: str):
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    user: Dict[str, Any] = Depends(get_current_user)
+):
     """Logout user (invalidate tokens)"""
-    # TODO: Implement token invalidation
+    auth_service.revoke(user)
+
+    if request and request.refresh_token:
+        try:
+            refresh_claims = auth_service.verify_token(request.refresh_token, token_type="refresh")
+            if refresh_claims["sub"] == user["sub"]:
+                auth_service.revoke(refresh_claims)
+        except AuthError:
+            pass  # Already invalid
+
     return {"message": "Logged out successfully"}
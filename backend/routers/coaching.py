@@ -3,17 +3,21 @@
 # Built by Byte (Backend Agent) - Day 6-7
 # Requirement: Dustin's Feature #2 - Response time <3 seconds
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from services.openai_service import OpenAIService
 from services.weather_service import WeatherService
+from services.station_index import StationIndex
+from services.quota_service import QuotaService
+from services.metrics import TimedRoute
+from routers.auth import get_optional_user, get_current_user
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 # Request/Response models
 class WeatherAnalysisRequest(BaseModel):
@@ -50,9 +54,61 @@ class ChatResponse(BaseModel):
 # Dependency for services
 openai_service = OpenAIService()
 weather_service = WeatherService()
+quota_service = QuotaService()
+
+COACHING_FALLBACK = "I'm experiencing technical difficulties. Please try again in a moment."
+station_index = StationIndex.from_file()  # Built once; lookups are O(log n)
+
+# Enroute weather: this many closest reporting stations within this radius
+ENROUTE_STATIONS = 3
+ENROUTE_RADIUS_NM = 60
+
+def _position_lat_lon(position: Optional[Dict[str, float]]) -> Optional[Tuple[float, float]]:
+    """Accept {lat, lon} or {latitude, longitude}"""
+    if not position:
+        return None
+    lat = position.get("lat", position.get("latitude"))
+    lon = position.get("lon", position.get("longitude"))
+    if lat is None or lon is None:
+        return None
+    return lat, lon
+
+async def enforce_ai_quota(
+    request: Request,
+    response: Response,
+    user: Optional[Dict[str, Any]] = Depends(get_optional_user)
+) -> str:
+    """
+    Consume one AI query from the caller's monthly quota
+
+    Answered from in-memory counters (no database round trip). Signed-in
+    users are identified by their access token; anonymous callers by client
+    IP (never by a client-supplied ID, which would be trivial to rotate).
+    """
+    if user:
+        user_id = user["sub"]
+        quota_service.set_tier(user_id, user["tier"])
+    else:
+        user_id = f"ip:{request.client.host if request.client else 'unknown'}"
+    allowed, usage = quota_service.consume(user_id)
+
+    if usage["limit"] is not None:
+        response.headers["X-RateLimit-Limit"] = str(usage["limit"])
+        response.headers["X-RateLimit-Remaining"] = str(usage["queries_remaining"])
+
+    if not allowed:
+        logger.warning("⛔ AI quota exceeded for %s (%s tier)", user_id, usage["subscription_tier"])
+        raise HTTPException(
+            status_code=429,
+            detail=f"Monthly AI query limit reached ({usage['limit']} for {usage['subscription_tier']} tier). "
+                   "Upgrade for more queries.",
+            headers={"X-RateLimit-Limit": str(usage["limit"]), "X-RateLimit-Remaining": "0"}
+        )
+
+    return user_id
 
 @router.post("/weather-analysis", response_model=WeatherAnalysisResponse)
-async def analyze_weather(request: WeatherAnalysisRequest):
+async def analyze_weather(request: WeatherAnalysisRequest, user_id: str = Depends(enforce_ai_quota)):
     """
     AI-powered weather decision support
 
@@ -72,11 +128,20 @@ async def analyze_weather(request: WeatherAnalysisRequest):
     start_time = datetime.now()
 
     try:
-        logger.info(f"🌤️ Weather analysis requested: {request.departure_airport} → {request.arrival_airport}")
+        logger.info("🌤️ Weather analysis requested: %s → %s", request.departure_airport, request.arrival_airport)
+
+        # Reporting stations near the aircraft, if enroute
+        nearby = []
+        position = _position_lat_lon(request.current_position)
+        if position:
+            nearby = station_index.nearest(*position, k=ENROUTE_STATIONS, max_distance_nm=ENROUTE_RADIUS_NM)
 
-        # Fetch weather data (METARs/TAFs)
-        departure_weather = await weather_service.get_metar(request.departure_airport)
-        arrival_weather = await weather_service.get_metar(request.arrival_airport)
+        # Fetch weather data (METARs) for departure, arrival and nearby stations in one request
+        codes = [request.departure_airport, request.arrival_airport]
+        codes += [station["icao"] for station in nearby if station["icao"] not in codes]
+        metars = await weather_service.get_metars(codes)
+        departure_weather = metars.get(request.departure_airport)
+        arrival_weather = metars.get(request.arrival_airport)
 
         if not departure_weather or not arrival_weather:
             raise HTTPException(
@@ -97,7 +162,16 @@ async def analyze_weather(request: WeatherAnalysisRequest):
             "aircraft": request.aircraft_type or "Single-engine piston",
             "pilot_hours": request.pilot_experience_hours or "Not specified",
             "fuel_remaining": f"{request.fuel_remaining} gallons" if request.fuel_remaining else "Not specified",
-            "current_position": request.current_position
+            "current_position": request.current_position,
+            "enroute_weather": [
+                {
+                    "airport": station["icao"],
+                    "name": station["name"],
+                    "distance_nm": station["distance_nm"],
+                    "metar": metars[station["icao"]]
+                }
+                for station in nearby if metars.get(station["icao"])
+            ]
         }
 
         # Get AI analysis
@@ -105,15 +179,17 @@ async def analyze_weather(request: WeatherAnalysisRequest):
             context=context,
             custom_question=request.custom_question
         )
+        if analysis.get("fallback"):
+            quota_service.refund(user_id)
 
         # Calculate response time
         elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
 
-        logger.info(f"✅ Weather analysis completed in {elapsed_ms}ms")
+        logger.info("✅ Weather analysis completed in %dms", elapsed_ms)
 
         # Warn if response time exceeds Dustin's requirement
         if elapsed_ms > 3000:
-            logger.warning(f"⚠️ Response time {elapsed_ms}ms exceeds 3-second target!")
+            logger.warning("⚠️ Response time %dms exceeds 3-second target!", elapsed_ms)
 
         return WeatherAnalysisResponse(
             recommendation=analysis["recommendation"],
@@ -125,15 +201,20 @@ async def analyze_weather(request: WeatherAnalysisRequest):
             response_time_ms=elapsed_ms
         )
 
+    except HTTPException:
+        # Failed requests don't count against the quota
+        quota_service.refund(user_id)
+        raise
     except Exception as e:
-        logger.error(f"❌ Weather analysis failed: {str(e)}")
+        quota_service.refund(user_id)
+        logger.error("❌ Weather analysis failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Weather analysis failed: {str(e)}"
         )
 
 @router.post("/chat", response_model=ChatResponse)
-async def ai_coaching_chat(message: ChatMessage):
+async def ai_coaching_chat(message: ChatMessage, user_id: str = Depends(enforce_ai_quota)):
     """
     General AI safety coaching chat
 
@@ -142,7 +223,7 @@ async def ai_coaching_chat(message: ChatMessage):
     start_time = datetime.now()
 
     try:
-        logger.info(f"💬 AI chat: {message.message[:50]}...")
+        logger.info("💬 AI chat: %.50s...", message.message)
 
         # Get AI response
         response_text = await openai_service.get_coaching_response(
@@ -150,36 +231,49 @@ async def ai_coaching_chat(message: ChatMessage):
             context=message.context
         )
 
-        elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+    except Exception:
+        # Canned reply instead of an error; failed requests don't count against the quota
+        quota_service.refund(user_id)
+        response_text = COACHING_FALLBACK
 
-        return ChatResponse(
-            response=response_text,
-            response_time_ms=elapsed_ms
-        )
+    elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
 
-    except Exception as e:
-        logger.error(f"❌ Chat failed: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"AI chat failed: {str(e)}"
-        )
+    return ChatResponse(
+        response=response_text,
+        response_time_ms=elapsed_ms
+    )
+
+@router.get("/stations/nearby")
+async def get_nearby_stations(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: Optional[int] = Query(None, ge=1, le=25, description=f"Number of stations (default {ENROUTE_STATIONS})"),
+    radius_nm: Optional[float] = Query(None, gt=0, description="Only stations within this distance")
+):
+    """
+    Nearest weather-reporting stations to a position
+
+    With radius_nm and no k, returns every station within the radius;
+    otherwise the k closest (optionally capped at radius_nm).
+    Returns stations closest first, each with distance_nm.
+    """
+    if k is None and radius_nm is not None:
+        return {"stations": station_index.within_radius(lat, lon, radius_nm)}
+    return {"stations": station_index.nearest(lat, lon, k=k or ENROUTE_STATIONS, max_distance_nm=radius_nm)}
 
 @router.get("/usage/{user_id}")
-async def get_ai_usage(user_id: str):
+async def get_ai_usage(user_id: str, user: Dict[str, Any] = Depends(get_current_user)):
     """
     Get AI usage statistics for subscription enforcement
 
+    Requires the user's own access token.
+
     Returns:
     - queries_this_month: Number of AI queries used
     - queries_remaining: Remaining queries (based on subscription tier)
     - subscription_tier: free/pro/ultimate
     """
-    # TODO: Implement database query for actual usage
-    # For M2 demo, return mock data
-    return {
-        "user_id": user_id,
-        "queries_this_month": 3,
-        "queries_remaining": 7,
-        "subscription_tier": "free",
-        "limit": 10
-    }
+    if user["sub"] != user_id:
+        raise HTTPException(status_code=403, detail="Cannot view another user's usage")
+    quota_service.set_tier(user_id, user["tier"])
+    return quota_service.get_usage(user_id)
@@ -3,18 +3,33 @@
 # Built by Byte (Backend Agent) - Day 8-9
 # Requirement: Dustin's Feature #3 (Engine Parameter Trend Analysis)
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Query, Response
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID, uuid4
+from collections import deque
+from services.engine_monitor import EngineMonitor
+from services.telemetry_hub import TelemetryHub, RollingAggregates, encode_message
+from services.metrics import TimedRoute
+from services.responses import FastJSONResponse
+from starlette.websockets import WebSocketState
+import io
+import csv
+import json
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=TimedRoute)
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 # Models
 class EngineDataPoint(BaseModel):
-    """Engine parameter data point"""
-    timestamp: datetime = Field(default_factory=datetime.now)
+    """Engine parameter data point (timestamps are stored as naive UTC)"""
+    timestamp: datetime = Field(default_factory=_utc_now)
     oil_pressure: Optional[float] = Field(None, description="Oil pressure (PSI)")
     oil_temperature: Optional[float] = Field(None, description="Oil temperature (°F)")
     cht: Optional[float] = Field(None, description="Cylinder head temperature (°F)")
@@ -22,6 +37,14 @@ class EngineDataPoint(BaseModel):
     rpm: Optional[float] = Field(None, description="Engine RPM")
     fuel_quantity: Optional[float] = Field(None, description="Fuel quantity (gallons)")
 
+    @field_validator("timestamp")
+    @classmethod
+    def _normalize_timestamp(cls, value: datetime) -> datetime:
+        # Mixing aware and naive timestamps breaks elapsed-time math in the detectors
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
 class FlightCreate(BaseModel):
     """Create new flight log"""
     departure_airport: Optional[str] = None
@@ -52,9 +75,56 @@ class EngineTrendResponse(BaseModel):
     trend: str  # "stable", "increasing", "decreasing"
     alert: Optional[str] = None
 
+class EngineAlertResponse(BaseModel):
+    """Alert raised by streaming engine anomaly detection"""
+    parameter: str
+    detector: str  # "range", "rate_of_change", "drift"
+    severity: str  # "caution", "warning"
+    message: str
+    value: float
+    timestamp: datetime
+
+# Engine parameter columns, in EngineDataPoint field order
+ENGINE_PARAMETERS = [name for name in EngineDataPoint.model_fields if name != "timestamp"]
+
 # In-memory storage for M2 demo (replace with Supabase in Day 8-9)
 flights_db = {}
 engine_data_db = {}
+engine_alerts_db = {}
+engine_aggregates_db = {}
+
+# Most recent alerts kept per flight, and how many a live snapshot includes
+MAX_STORED_ALERTS = 500
+SNAPSHOT_ALERTS = 50
+
+# Streaming detectors (O(1) state per flight and parameter)
+engine_monitor = EngineMonitor()
+
+# Live WebSocket viewers per flight
+telemetry_hub = TelemetryHub(max_queue=64)
+
+def _ingest_engine_data(flight_id: str, data_points: List[EngineDataPoint]) -> List[dict]:
+    """Store data points, run them through the engine monitor and notify live viewers"""
+    aggregates = engine_aggregates_db[flight_id]
+    new_alerts = []
+    for data in data_points:
+        sample = data.dict()
+        # Detect first: if it fails, nothing has been stored for this point
+        alerts = engine_monitor.observe(flight_id, sample)
+        engine_data_db[flight_id].append(sample)
+        engine_alerts_db[flight_id].extend(alerts)
+        changed = aggregates.update(sample, engine_monitor.limits)
+        new_alerts.extend(alerts)
+
+        telemetry_hub.publish(flight_id, {
+            "type": "sample",
+            "flight_id": flight_id,
+            "data_point": sample,
+            "aggregates": changed,
+            "alerts": alerts
+        })
+
+    return new_alerts
 
 @router.post("/", response_model=FlightResponse)
 async def create_flight(flight: FlightCreate):
@@ -83,6 +153,8 @@ async def create_flight(flight: FlightCreate):
 
     flights_db[flight_id] = flight_data
     engine_data_db[flight_id] = []
+    engine_alerts_db[flight_id] = deque(maxlen=MAX_STORED_ALERTS)
+    engine_aggregates_db[flight_id] = RollingAggregates()
 
     return FlightResponse(**flight_data)
 
@@ -97,22 +169,170 @@ async def add_engine_data(flight_id: str, data: EngineDataPoint):
         raise HTTPException(status_code=404, detail="Flight not found")
 
     # TODO (Day 8-9): Store in Supabase engine_parameters table
-    engine_data_db[flight_id].append(data.dict())
+    alerts = _ingest_engine_data(flight_id, [data])
+
+    return {"message": "Engine data recorded", "data_point": data, "alerts": alerts}
+
+@router.post("/{flight_id}/engine-data/bulk")
+async def add_engine_data_bulk(flight_id: str, data_points: List[EngineDataPoint]):
+    """
+    Add a batch of engine data points (e.g. synced after an offline flight)
+
+    Points are processed in the order given, same as individual uploads.
+    """
+    if flight_id not in flights_db:
+        raise HTTPException(status_code=404, detail="Flight not found")
+
+    alerts = _ingest_engine_data(flight_id, data_points)
+
+    return {
+        "message": "Engine data recorded",
+        "data_points_recorded": len(data_points),
+        "alerts": alerts
+    }
+
+@router.websocket("/{flight_id}/live")
+async def live_engine_data(websocket: WebSocket, flight_id: str):
+    """
+    Live engine telemetry channel for in-flight monitoring
+
+    On connect the server sends a snapshot (rolling aggregates + recent alerts)
+    instead of the full history. After that, every connected viewer (pilot,
+    instructor) receives one "sample" delta per recorded data point, whether
+    it arrived over this socket or via POST /engine-data.
+
+    Client -> server:
+        {"type": "sample", "data": {EngineDataPoint fields}}
 
-    return {"message": "Engine data recorded", "data_point": data}
+    Server -> client:
+        {"type": "snapshot", "aggregates": {...}, "alerts": [...], "viewers": n}
+        {"type": "sample", "data_point": {...}, "aggregates": {...}, "alerts": [...]}
+        {"type": "error", "detail": "..."}
+        {"type": "flight_deleted"}, then the socket closes with code 4404
 
-@router.get("/{flight_id}/engine-data")
+    Each viewer has a bounded outbound queue; a viewer that can't keep up
+    loses its oldest pending deltas rather than slowing everyone else down.
+    """
+    if flight_id not in flights_db:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    subscriber = telemetry_hub.subscribe(flight_id, websocket)
+    subscriber.offer(encode_message({
+        "type": "snapshot",
+        "flight_id": flight_id,
+        "aggregates": engine_aggregates_db[flight_id].snapshot(),
+        "alerts": list(engine_alerts_db[flight_id])[-SNAPSHOT_ALERTS:],
+        "viewers": telemetry_hub.viewer_count(flight_id)
+    }))
+    sender = subscriber.start()
+    close_code = 1000
+
+    try:
+        while True:
+            text = await websocket.receive_text()
+
+            try:
+                message = json.loads(text)
+            except json.JSONDecodeError:
+                subscriber.offer(encode_message({"type": "error", "detail": "Message is not valid JSON"}))
+                continue
+            if not isinstance(message, dict) or message.get("type") != "sample":
+                subscriber.offer(encode_message({"type": "error", "detail": "Unsupported message type"}))
+                continue
+            if flight_id not in flights_db:
+                subscriber.offer(encode_message({"type": "error", "detail": "Flight not found"}))
+                continue
+
+            data = message.get("data") or {}
+            if not isinstance(data, dict):
+                subscriber.offer(encode_message({"type": "error", "detail": "Sample data must be an object"}))
+                continue
+            try:
+                data = EngineDataPoint(**data)
+            except ValidationError as e:
+                subscriber.offer(encode_message({"type": "error", "detail": str(e)}))
+                continue
+
+            _ingest_engine_data(flight_id, [data])
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("❌ Live telemetry connection error: %s", e)
+        close_code = 1011
+    finally:
+        sender.cancel()
+        telemetry_hub.unsubscribe(flight_id, subscriber)
+        if WebSocketState.DISCONNECTED not in (websocket.client_state, websocket.application_state):
+            try:
+                await websocket.close(code=close_code)
+            except Exception:
+                pass  # Client already gone
+
+@router.get("/{flight_id}/engine-data", response_class=FastJSONResponse)
 async def get_engine_data(flight_id: str):
     """Get all engine data for a flight"""
     if flight_id not in flights_db:
         raise HTTPException(status_code=404, detail="Flight not found")
 
-    return {
+    return FastJSONResponse({
         "flight_id": flight_id,
         "data_points": engine_data_db.get(flight_id, [])
-    }
+    })
+
+@router.get("/{flight_id}/export")
+async def export_flight(flight_id: str, format_: str = Query("columnar", alias="format", pattern="^(columnar|csv)$")):
+    """
+    Download a flight's engine data in a compact columnar form
+
+    columnar: {"flight": {...}, "columns": {"timestamp_ms": [...], "oil_pressure": [...], ...}, "alerts": [...]}
+              Timestamps are epoch milliseconds (UTC); missing readings are null.
+    csv:      timestamp,oil_pressure,...,fuel_quantity with one row per data point
+              (ISO 8601 UTC timestamps with a Z suffix)
+    """
+    if flight_id not in flights_db:
+        raise HTTPException(status_code=404, detail="Flight not found")
+
+    data_points = engine_data_db.get(flight_id, [])
+
+    if format_ == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["timestamp"] + ENGINE_PARAMETERS)
+        for point in data_points:
+            writer.writerow([point["timestamp"].isoformat() + "Z"] + [point[name] for name in ENGINE_PARAMETERS])
+        return Response(
+            buffer.getvalue(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="flight-{flight_id}.csv"'}
+        )
+
+    columns = {"timestamp_ms": [
+        int(point["timestamp"].replace(tzinfo=timezone.utc).timestamp() * 1000) for point in data_points
+    ]}
+    for name in ENGINE_PARAMETERS:
+        columns[name] = [point[name] for point in data_points]
+
+    return FastJSONResponse(
+        {
+            "flight": flights_db[flight_id],
+            "columns": columns,
+            "alerts": list(engine_alerts_db.get(flight_id, ()))
+        },
+        headers={"Content-Disposition": f'attachment; filename="flight-{flight_id}.json"'}
+    )
+
+@router.get("/{flight_id}/alerts", response_model=List[EngineAlertResponse], response_class=FastJSONResponse)
+async def get_engine_alerts(flight_id: str):
+    """Get alerts raised by engine anomaly detection for a flight"""
+    if flight_id not in flights_db:
+        raise HTTPException(status_code=404, detail="Flight not found")
+
+    return FastJSONResponse(list(engine_alerts_db.get(flight_id, ())))
 
-@router.get("/{flight_id}/trends", response_model=List[EngineTrendResponse])
+@router.get("/{flight_id}/trends", response_model=List[EngineTrendResponse], response_class=FastJSONResponse)
 async def get_engine_trends(flight_id: str):
     """
     Get engine parameter trends (last 10 flights)
@@ -184,14 +404,14 @@ async def get_engine_trends(flight_id: str):
         )
     ]
 
-    return mock_trends
+    return FastJSONResponse(mock_trends)
 
-@router.get("/")
+@router.get("/", response_class=FastJSONResponse)
 async def get_flights(user_id: str, limit: int = 20):
     """Get user's flight logs"""
     # TODO (Day 8-9): Query Supabase flights table with pagination
     user_flights = [f for f in flights_db.values() if f["user_id"] == user_id]
-    return {"flights": user_flights[:limit], "total": len(user_flights)}
+    return FastJSONResponse({"flights": user_flights[:limit], "total": len(user_flights)})
 
 @router.delete("/{flight_id}")
 async def delete_flight(flight_id: str):
@@ -202,5 +422,10 @@ async def delete_flight(flight_id: str):
     del flights_db[flight_id]
     if flight_id in engine_data_db:
         del engine_data_db[flight_id]
+    engine_alerts_db.pop(flight_id, None)
+    engine_aggregates_db.pop(flight_id, None)
+    engine_monitor.reset(flight_id)
+    telemetry_hub.publish(flight_id, {"type": "flight_deleted", "flight_id": flight_id})
+    await telemetry_hub.close_flight(flight_id)
 
     return {"message": "Flight deleted"}
@@ -0,0 +1,222 @@
+# Auth Service
+# Apple identity token verification and Guardian One JWT issuance
+# Requirement: Apple Sign-In, HS256 JWTs (24h access tokens)
+#
+# Kept off the request hot path: Apple's JWKS is cached and refreshed in the
+# background, and recently verified tokens are held in a bounded LRU keyed by
+# token hash, so repeat requests skip signature verification entirely.
+
+import os
+import time
+import uuid
+import asyncio
+import hashlib
+import secrets
+import logging
+from typing import Dict, Any, Optional
+
+import aiohttp
+from cachetools import LRUCache
+from jose import jwt, JWTError
+
+logger = logging.getLogger(__name__)
+
+APPLE_ISSUER = "https://appleid.apple.com"
+APPLE_KEYS_URL = os.getenv("APPLE_KEYS_URL", "https://appleid.apple.com/auth/keys")
+
+
+class AuthError(Exception):
+    """Raised when a token is missing, invalid, expired or revoked"""
+
+
+class AppleKeySet:
+    """Cached Apple Sign-In public keys (JWKS) with background refresh"""
+
+    def __init__(
+        self,
+        keys_url: str = APPLE_KEYS_URL,
+        refresh_interval: float = 6 * 3600,
+        min_refetch_interval: float = 60
+    ):
+        """Initialize key set (refresh intervals in seconds)"""
+        self.keys_url = keys_url
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.keys: Dict[str, Dict[str, Any]] = {}
+        self.fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def refresh(self):
+        """Fetch the current key set from Apple"""
+        async with aiohttp.ClientSession() as session:
+            async with session.get(self.keys_url, timeout=5) as response:
+                response.raise_for_status()
+                payload = await response.json()
+
+        self.keys = {key["kid"]: key for key in payload.get("keys", [])}
+        self.fetched_at = time.monotonic()
+        logger.info("🔑 Loaded %d Apple signing keys", len(self.keys))
+
+    async def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a signing key by key ID
+
+        An unknown kid usually means Apple rotated keys, so the set is
+        refetched once (rate limited by min_refetch_interval).
+        """
+        key = self.keys.get(kid)
+        if key is not None:
+            return key
+
+        async with self._lock:
+            if kid not in self.keys and time.monotonic() - self.fetched_at > self.min_refetch_interval:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    logger.error("❌ Apple key refresh failed: %s", e)
+        return self.keys.get(kid)
+
+    async def start(self):
+        """Load keys and start periodic background refresh"""
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("⚠️ Initial Apple key fetch failed, will retry on demand: %s", e)
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop background refresh"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the cached keys
+                logger.error("❌ Apple key refresh failed: %s", e)
+
+
+class AuthService:
+    """Issues, verifies and revokes Guardian One JWTs"""
+
+    ALGORITHM = "HS256"
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        apple_client_id: Optional[str] = None,
+        apple_keys: Optional[AppleKeySet] = None,
+        access_ttl: int = 24 * 3600,
+        refresh_ttl: int = 30 * 24 * 3600,
+        cache_size: int = 10000
+    ):
+        """Initialize auth service (secret and client ID default to environment)"""
+        self.secret = secret or os.getenv("JWT_SECRET")
+        if not self.secret:
+            logger.warning("⚠️ JWT_SECRET not set - using a random secret (tokens won't survive restarts)")
+            self.secret = secrets.token_hex(32)
+
+        self.apple_client_id = apple_client_id or os.getenv("APPLE_CLIENT_ID", "com.msrresearch.guardianone")
+        self.apple_keys = apple_keys or AppleKeySet()
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+
+        # sha256(token) -> verified claims
+        self._verified: LRUCache = LRUCache(maxsize=cache_size)
+        # Revoked token ID (jti) -> expiry, pruned once tokens would have expired anyway
+        self._denylist: Dict[str, int] = {}
+        self._next_prune = 0.0
+
+    async def verify_apple_token(self, identity_token: str) -> Dict[str, Any]:
+        """
+        Verify an Apple identity token against Apple's public keys
+
+        Returns:
+            Token claims (sub is the stable Apple user identifier)
+        """
+        try:
+            kid = jwt.get_unverified_header(identity_token).get("kid")
+        except JWTError as e:
+            raise AuthError(f"Malformed identity token: {str(e)}")
+
+        key = await self.apple_keys.get_key(kid) if kid else None
+        if key is None:
+            raise AuthError("Unknown identity token signing key")
+
+        try:
+            return jwt.decode(
+                identity_token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=self.apple_client_id,
+                issuer=APPLE_ISSUER
+            )
+        except JWTError as e:
+            raise AuthError(f"Invalid identity token: {str(e)}")
+
+    def issue_tokens(self, user_id: str, subscription_tier: str) -> Dict[str, Any]:
+        """Issue an access/refresh token pair for a user"""
+        now = int(time.time())
+        claims = {"sub": user_id, "tier": subscription_tier, "iat": now}
+
+        access_token = jwt.encode(
+            {**claims, "type": "access", "jti": uuid.uuid4().hex, "exp": now + self.access_ttl},
+            self.secret, algorithm=self.ALGORITHM
+        )
+        refresh_token = jwt.encode(
+            {**claims, "type": "refresh", "jti": uuid.uuid4().hex, "exp": now + self.refresh_ttl},
+            self.secret, algorithm=self.ALGORITHM
+        )
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": self.access_ttl
+        }
+
+    def verify_token(self, token: str, token_type: str = "access") -> Dict[str, Any]:
+        """
+        Verify a Guardian One JWT
+
+        Served from the verified-token cache when possible; only expiry and
+        the revocation denylist are re-checked on a hit.
+
+        Raises:
+            AuthError: If the token is invalid, expired, revoked or the wrong type
+        """
+        cache_key = hashlib.sha256(token.encode()).digest()
+        claims = self._verified.get(cache_key)
+
+        if claims is None:
+            try:
+                claims = jwt.decode(token, self.secret, algorithms=[self.ALGORITHM])
+            except JWTError as e:
+                raise AuthError(f"Invalid token: {str(e)}")
+            self._verified[cache_key] = claims
+        elif claims["exp"] <= time.time():
+            del self._verified[cache_key]
+            raise AuthError("Token has expired")
+
+        if claims.get("type") != token_type:
+            raise AuthError(f"Expected {token_type} token")
+        if claims["jti"] in self._denylist:
+            raise AuthError("Token has been revoked")
+
+        return claims
+
+    def revoke(self, claims: Dict[str, Any]):
+        """Revoke a verified token until it would have expired"""
+        self._denylist[claims["jti"]] = claims["exp"]
+
+        now = time.time()
+        if now >= self._next_prune:
+            self._denylist = {jti: exp for jti, exp in self._denylist.items() if exp > now}
+            self._next_prune = now + 300
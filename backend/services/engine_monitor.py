@@ -0,0 +1,300 @@
+# Engine Monitor Service
+# Streaming anomaly detection for engine parameter telemetry
+# Requirement: Dustin's Feature #3 (alert for out-of-range values and concerning trends)
+#
+# Every detector keeps constant-size state per (flight, parameter), so each
+# ingested sample costs O(1) no matter how long the flight history grows.
+
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ParameterLimits:
+    """Operating limits and detector tuning for one engine parameter"""
+
+    __slots__ = ("label", "unit", "low", "high", "max_rate_per_min", "drift_sigma")
+
+    def __init__(
+        self,
+        label: str,
+        unit: str,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        max_rate_per_min: Optional[float] = None,
+        drift_sigma: Optional[float] = None
+    ):
+        self.label = label
+        self.unit = unit
+        self.low = low
+        self.high = high
+        self.max_rate_per_min = max_rate_per_min
+        # Noise floor for drift detection (None disables EWMA/CUSUM)
+        self.drift_sigma = drift_sigma
+
+
+# Typical limits for a normally aspirated GA piston engine (C172 / O-320 class).
+# Always defer to the aircraft POH; these drive advisories, not limitations.
+DEFAULT_LIMITS: Dict[str, ParameterLimits] = {
+    "oil_pressure": ParameterLimits("Oil pressure", "PSI", low=25.0, high=115.0,
+                                    max_rate_per_min=15.0, drift_sigma=2.0),
+    "oil_temperature": ParameterLimits("Oil temperature", "°F", low=100.0, high=245.0,
+                                       max_rate_per_min=20.0, drift_sigma=3.0),
+    "cht": ParameterLimits("CHT", "°F", low=200.0, high=500.0,
+                           max_rate_per_min=50.0, drift_sigma=5.0),
+    "egt": ParameterLimits("EGT", "°F", low=1000.0, high=1650.0,
+                           max_rate_per_min=150.0, drift_sigma=15.0),
+    "rpm": ParameterLimits("RPM", "RPM", high=2700.0, drift_sigma=None),
+    # Fuel burns down by design, so only a floor and a leak-rate check apply
+    "fuel_quantity": ParameterLimits("Fuel quantity", "gal", low=8.0,
+                                     max_rate_per_min=1.0, drift_sigma=None),
+}
+
+
+def _alert(
+    parameter: str,
+    detector: str,
+    severity: str,
+    message: str,
+    value: float,
+    timestamp: datetime
+) -> Dict[str, Any]:
+    return {
+        "parameter": parameter,
+        "detector": detector,
+        "severity": severity,
+        "message": message,
+        "value": value,
+        "timestamp": timestamp
+    }
+
+
+class RangeDetector:
+    """Flags values outside [low, high]; alerts once per excursion"""
+
+    __slots__ = ("limits", "in_violation")
+
+    def __init__(self, limits: ParameterLimits):
+        self.limits = limits
+        self.in_violation = False
+
+    def update(self, parameter: str, value: float, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        limits = self.limits
+        below = limits.low is not None and value < limits.low
+        above = limits.high is not None and value > limits.high
+
+        if not (below or above):
+            self.in_violation = False
+            return None
+        if self.in_violation:
+            return None
+
+        self.in_violation = True
+        bound = limits.low if below else limits.high
+        direction = "below minimum" if below else "above maximum"
+        return _alert(
+            parameter, "range", "warning",
+            f"⚠️ {limits.label} {value:g} {limits.unit} {direction} ({bound:g} {limits.unit})",
+            value, timestamp
+        )
+
+
+class RateOfChangeDetector:
+    """
+    Flags changes faster than max_rate_per_min; alerts once per excursion
+
+    The rate is measured against a reference sample at least min_window_s
+    old, not the previous sample, so high-rate sensor noise (e.g. 1 Hz
+    telemetry) doesn't read as a rapid change.
+    """
+
+    __slots__ = ("limits", "min_window_s", "ref_value", "ref_timestamp", "in_violation")
+
+    def __init__(self, limits: ParameterLimits, min_window_s: float = 60.0):
+        self.limits = limits
+        self.min_window_s = min_window_s
+        self.ref_value: Optional[float] = None
+        self.ref_timestamp: Optional[datetime] = None
+        self.in_violation = False
+
+    def update(self, parameter: str, value: float, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        if self.ref_value is None or self.ref_timestamp is None:
+            self.ref_value, self.ref_timestamp = value, timestamp
+            return None
+
+        elapsed_s = (timestamp - self.ref_timestamp).total_seconds()
+        if elapsed_s < 0:
+            # Out-of-order sample: restart the window from here
+            self.ref_value, self.ref_timestamp = value, timestamp
+            return None
+        if elapsed_s < self.min_window_s:
+            return None
+
+        rate = (value - self.ref_value) / (elapsed_s / 60)
+        self.ref_value, self.ref_timestamp = value, timestamp
+
+        limits = self.limits
+        if abs(rate) <= limits.max_rate_per_min:
+            self.in_violation = False
+            return None
+        if self.in_violation:
+            return None
+
+        self.in_violation = True
+        direction = "rising" if rate > 0 else "falling"
+        return _alert(
+            parameter, "rate_of_change", "warning",
+            f"⚠️ {limits.label} {direction} {abs(rate):.1f} {limits.unit}/min "
+            f"(limit {limits.max_rate_per_min:g} {limits.unit}/min)",
+            value, timestamp
+        )
+
+
+class DriftDetector:
+    """
+    Two-sided CUSUM against an EWMA baseline
+
+    The baseline mean/variance are exponentially weighted over time
+    (alpha = 1 - exp(-dt / tau)), not per sample, so at 1 Hz telemetry the
+    baseline still lags a slow creep (e.g. CHT rising a few degrees per
+    minute) and the CUSUM sums build up well before any absolute limit is
+    crossed. Alerts once per excursion: the sums are capped at h while the
+    drift persists and the detector re-arms once both fall back to zero.
+    """
+
+    __slots__ = ("limits", "tau_s", "k", "h", "warmup", "count", "mean", "var",
+                 "pos", "neg", "last_timestamp", "in_violation")
+
+    def __init__(
+        self,
+        limits: ParameterLimits,
+        tau_min: float = 10.0,
+        k: float = 0.5,
+        h: float = 5.0,
+        warmup: int = 5
+    ):
+        self.limits = limits
+        self.tau_s = tau_min * 60  # Baseline time constant
+        self.k = k          # Allowed slack, in standard deviations
+        self.h = h          # Decision threshold, in standard deviations
+        self.warmup = warmup
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.pos = 0.0
+        self.neg = 0.0
+        self.last_timestamp: Optional[datetime] = None
+        self.in_violation = False
+
+    def _restart(self, value: float, timestamp: datetime):
+        self.count = 1
+        self.mean = value
+        self.var = 0.0
+        self.pos = 0.0
+        self.neg = 0.0
+        self.last_timestamp = timestamp
+        self.in_violation = False
+
+    def update(self, parameter: str, value: float, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        if self.last_timestamp is None:
+            self._restart(value, timestamp)
+            return None
+
+        elapsed_s = (timestamp - self.last_timestamp).total_seconds()
+        if elapsed_s < 0:
+            # Out-of-order sample: start a fresh baseline from here
+            self._restart(value, timestamp)
+            return None
+        self.last_timestamp = timestamp
+        self.count += 1
+        alert = None
+        diff = value - self.mean
+
+        if self.count > self.warmup:
+            sigma = max(math.sqrt(self.var), self.limits.drift_sigma)
+            z = diff / sigma
+            self.pos = max(0.0, self.pos + z - self.k)
+            self.neg = max(0.0, self.neg - z - self.k)
+
+            if self.pos > self.h or self.neg > self.h:
+                if not self.in_violation:
+                    direction = "increasing" if self.pos > self.h else "decreasing"
+                    limits = self.limits
+                    alert = _alert(
+                        parameter, "drift", "caution",
+                        f"📈 {limits.label} {direction} - trending away from baseline "
+                        f"{self.mean:.1f} {limits.unit}, monitor closely",
+                        value, timestamp
+                    )
+                self.in_violation = True
+                self.pos = min(self.pos, self.h)
+                self.neg = min(self.neg, self.h)
+            elif self.pos == 0.0 and self.neg == 0.0:
+                self.in_violation = False
+
+        # EWMA update after scoring, so a sample never masks itself
+        alpha = 1 - math.exp(-elapsed_s / self.tau_s)
+        incr = alpha * diff
+        self.mean += incr
+        self.var = (1 - alpha) * (self.var + diff * incr)
+        return alert
+
+
+class EngineMonitor:
+    """Runs per-parameter detectors incrementally for each flight"""
+
+    def __init__(self, limits: Optional[Dict[str, ParameterLimits]] = None):
+        """Initialize monitor with parameter limits (defaults to DEFAULT_LIMITS)"""
+        self.limits = limits or DEFAULT_LIMITS
+        # flight_id -> parameter -> detectors for that stream
+        self._detectors: Dict[str, Dict[str, list]] = {}
+
+    def _detectors_for(self, flight_detectors: Dict[str, list], parameter: str) -> list:
+        detectors = flight_detectors.get(parameter)
+        if detectors is None:
+            limits = self.limits[parameter]
+            detectors = []
+            if limits.low is not None or limits.high is not None:
+                detectors.append(RangeDetector(limits))
+            if limits.max_rate_per_min is not None:
+                detectors.append(RateOfChangeDetector(limits))
+            if limits.drift_sigma is not None:
+                detectors.append(DriftDetector(limits))
+            flight_detectors[parameter] = detectors
+        return detectors
+
+    def observe(self, flight_id: str, sample: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Feed one engine data point through the detectors
+
+        Args:
+            flight_id: Flight the sample belongs to
+            sample: Engine data point dict (naive UTC timestamp plus parameter values)
+
+        Returns:
+            Alerts raised by this sample (usually empty)
+        """
+        timestamp = sample.get("timestamp") or datetime.now(timezone.utc).replace(tzinfo=None)
+        flight_detectors = self._detectors.setdefault(flight_id, {})
+        alerts = []
+
+        for parameter in self.limits:
+            value = sample.get(parameter)
+            if value is None:
+                continue
+            for detector in self._detectors_for(flight_detectors, parameter):
+                alert = detector.update(parameter, value, timestamp)
+                if alert:
+                    alerts.append(alert)
+
+        if alerts:
+            logger.info("🚨 %d engine alert(s) raised for flight %s", len(alerts), flight_id)
+
+        return alerts
+
+    def reset(self, flight_id: str):
+        """Drop detector state for a flight"""
+        self._detectors.pop(flight_id, None)
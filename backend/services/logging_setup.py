@@ -0,0 +1,144 @@
+# Logging Setup
+# Structured JSON logs written by a background thread, off the event loop
+#
+# Request handlers only build a LogRecord and drop it on a bounded queue;
+# sampled-out records are never formatted, and JSON formatting and the
+# stdout write happen in a QueueListener thread. High-volume message types can be
+# sampled with LOG_SAMPLE_RATES, e.g. "weather_cache_hit=100,uvicorn.access=10"
+# keeps 1 in 100 cache-hit lines and 1 in 10 access log lines.
+
+import os
+import sys
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from pythonjsonlogger import jsonlogger
+
+# Keep 1 in N records per message type: extra={"log_type": ...}, else logger name
+DEFAULT_SAMPLE_RATES = {
+    "weather_cache_hit": 100,
+}
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in N records per message type; warnings and errors always pass"""
+
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = rates
+        self.counts: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        log_type = getattr(record, "log_type", None) or record.name
+        rate = self.rates.get(log_type)
+        if not rate or rate <= 1 or record.levelno >= logging.WARNING:
+            return True
+
+        count = self.counts.get(log_type, 0)
+        self.counts[log_type] = count + 1
+        if count % rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller
+
+    Records that survive sampling have their %-style message rendered here,
+    so mutable arguments are captured as they were at the log call; JSON
+    formatting and the write happen on the listener thread. When the queue
+    is full the record is dropped (and counted) rather than waiting.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RestartableQueueListener(QueueListener):
+    """
+    QueueListener whose start/stop are idempotent
+
+    The app lifespan can run more than once per process (tests, reloads);
+    stop() flushes and joins the writer thread, start() brings it back.
+    """
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if not self.running:
+            super().start()
+
+    def stop(self):
+        if self.running:
+            super().stop()
+
+
+def parse_sample_rates(value: Optional[str]) -> Dict[str, int]:
+    """Parse "type=N,type=N" into a rates dict (defaults when unset)"""
+    rates = dict(DEFAULT_SAMPLE_RATES)
+    if value:
+        for part in value.split(","):
+            name, _, rate = part.partition("=")
+            if name.strip() and rate.strip().isdigit():
+                rates[name.strip()] = int(rate)
+    return rates
+
+
+def setup_logging(level: int = logging.INFO) -> RestartableQueueListener:
+    """
+    Route root logging through a queue to a background JSON writer
+
+    LOG_FORMAT=text keeps human-readable output for local development.
+
+    Returns:
+        The started listener; stop() on shutdown flushes the queue, start()
+        resumes writing
+    """
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    else:
+        formatter = jsonlogger.JsonFormatter(
+            "%(levelname)s %(name)s %(message)s",
+            rename_fields={"levelname": "level", "name": "logger"},
+            timestamp=True,
+            json_ensure_ascii=False
+        )
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(parse_sample_rates(os.getenv("LOG_SAMPLE_RATES"))))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    # uvicorn installs its own synchronous stream handlers; send them through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    listener = RestartableQueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
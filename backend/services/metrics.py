@@ -0,0 +1,227 @@
+# Metrics Service
+# Prometheus-style counters and latency histograms, rendered at /metrics
+# Requirement: Dustin's Feature #2 - find where the 3-second budget goes
+#
+# Aggregation is plain in-process arithmetic: no locks, no background
+# threads. Everything runs on the event loop thread, so an observation is a
+# dict lookup, a bisect and an integer increment. Cumulative bucket counts
+# are only computed when /metrics is scraped.
+
+import time
+import asyncio
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Tuple, Optional, Callable
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+
+# Seconds; spans sub-millisecond cache lookups up to slow GPT-4 generations
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    __slots__ = ("name", "help", "label_names", "values")
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels"""
+
+    __slots__ = ("name", "help", "label_names", "buckets", "series")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last = +Inf), sum]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self.series.get(labels)
+        if series is None:
+            series = [[0] * (len(self.buckets) + 1), 0.0]
+            self.series[labels] = series
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    """All metrics exposed by the backend"""
+
+    def __init__(self):
+        self.http_request_duration = Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route",
+            ("method", "route", "status")
+        )
+        self.stage_duration = Histogram(
+            "stage_duration_seconds", "Latency of internal request stages",
+            ("stage",)
+        )
+        self.openai_tokens = Counter(
+            "openai_tokens_total", "OpenAI tokens consumed",
+            ("operation", "kind")
+        )
+        self.cache_lookups = Counter(
+            "weather_cache_lookups_total", "Weather cache lookups by result",
+            ("product", "result")
+        )
+        self.upstream_errors = Counter(
+            "upstream_errors_total", "Failed calls to external services",
+            ("upstream", "reason")
+        )
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Record the duration of a block under stage_duration_seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_duration.observe(time.perf_counter() - started, stage)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        metrics = (
+            self.http_request_duration, self.stage_duration, self.openai_tokens,
+            self.cache_lookups, self.upstream_errors
+        )
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# Per-request scratch space shared between the middleware and TimedRoute
+_request_info: ContextVar[Optional[dict]] = ContextVar("request_info", default=None)
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that reports its path template and serialization time
+
+    The endpoint is wrapped to note when it returns; everything after that
+    (response_model validation, JSON encoding) is recorded as the
+    "serialization" stage. Endpoints that build a Response themselves have
+    already encoded the body by then, so nothing is recorded here for them;
+    FastJSONResponse times its own render under the same stage.
+    """
+
+    def get_route_handler(self) -> Callable:
+        self.dependant.call = self._mark_endpoint_done(self.dependant.call)
+        handler = super().get_route_handler()
+        path = self.path
+
+        async def timed_handler(request):
+            info = _request_info.get()
+            if info is None:
+                return await handler(request)
+
+            info["route"] = path
+            response = await handler(request)
+            endpoint_done = info.get("endpoint_done")
+            if endpoint_done is not None:
+                metrics.stage_duration.observe(time.perf_counter() - endpoint_done, "serialization")
+            return response
+
+        return timed_handler
+
+    @staticmethod
+    def _mark_endpoint_done(call: Callable) -> Callable:
+        # Keep the endpoint's sync/async nature so FastAPI dispatches it the same way
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def async_endpoint(*args, **kwargs):
+                result = await call(*args, **kwargs)
+                info = _request_info.get()
+                if info is not None and not isinstance(result, Response):
+                    info["endpoint_done"] = time.perf_counter()
+                return result
+            return async_endpoint
+
+        @functools.wraps(call)
+        def sync_endpoint(*args, **kwargs):
+            result = call(*args, **kwargs)
+            # Runs in the threadpool; the dict is shared, so the mark is visible
+            info = _request_info.get()
+            if info is not None and not isinstance(result, Response):
+                info["endpoint_done"] = time.perf_counter()
+            return result
+        return sync_endpoint
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route HTTP latency"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        info = {"status": 500}
+        token = _request_info.set(info)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                info["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_info.reset(token)
+            metrics.http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"], info.get("route", "unmatched"), str(info["status"])
+            )
@@ -4,10 +4,13 @@
 # Requirement: Conservative, safety-first AI recommendations
 
 import os
+import time
+import asyncio
 from openai import AsyncOpenAI
 from typing import Dict, Any, Optional
 import logging
 import json
+from services.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +24,13 @@ class OpenAIService:
             logger.error("❌ OPENAI_API_KEY not set in environment")
             raise ValueError("OPENAI_API_KEY environment variable is required")
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # OPENAI_BASE_URL points at a compatible endpoint (e.g. the benchmark stand-in)
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=os.getenv("OPENAI_BASE_URL"))
         self.model = "gpt-4-turbo-preview"  # 128k context, faster responses
 
+        # Caps concurrent GPT-4 calls; time spent waiting here is the LLM queue wait
+        self._slots = asyncio.Semaphore(int(os.getenv("OPENAI_MAX_CONCURRENCY", "16")))
+
         # Aviation safety system prompt (conservative bias)
         self.SAFETY_SYSTEM_PROMPT = """You are Guardian One AI, an aviation safety advisor for general aviation pilots.
 
@@ -71,9 +78,26 @@ class OpenAIService:
             logger.info("✅ OpenAI API key validated")
             return True
         except Exception as e:
-            logger.error(f"❌ OpenAI API key validation failed: {str(e)}")
+            logger.error("❌ OpenAI API key validation failed: %s", e)
             return False
 
+    async def _complete(self, operation: str, **kwargs):
+        """Chat completion with queue-wait, generation and token metrics"""
+        queued = time.perf_counter()
+        async with self._slots:
+            metrics.stage_duration.observe(time.perf_counter() - queued, "llm_queue_wait")
+            try:
+                with metrics.time_stage("llm_generation"):
+                    response = await self.client.chat.completions.create(model=self.model, **kwargs)
+            except Exception as e:
+                metrics.upstream_errors.inc("openai", type(e).__name__)
+                raise
+
+        if response.usage:
+            metrics.openai_tokens.inc(operation, "prompt", amount=response.usage.prompt_tokens)
+            metrics.openai_tokens.inc(operation, "completion", amount=response.usage.completion_tokens)
+        return response
+
     async def analyze_weather_decision(
         self,
         context: Dict[str, Any],
@@ -107,14 +131,19 @@ class OpenAIService:
             if context.get('current_position'):
                 user_prompt += f"\n**Current Position**: {context['current_position']}"
 
+            if context.get('enroute_weather'):
+                user_prompt += "\n\n**Nearby Stations**:"
+                for station in context['enroute_weather']:
+                    user_prompt += f"\n- {station['airport']} ({station['name']}, {station['distance_nm']} nm): {station['metar']}"
+
             if custom_question:
                 user_prompt += f"\n\n**Pilot Question**: {custom_question}"
 
             user_prompt += "\n\nProvide your analysis in JSON format as specified in your instructions."
 
             # Call GPT-4
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._complete(
+                "weather_analysis",
                 messages=[
                     {"role": "system", "content": self.SAFETY_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
@@ -129,12 +158,12 @@ class OpenAIService:
             analysis = json.loads(analysis_json)
 
             # Log token usage for cost tracking
-            logger.info(f"📊 OpenAI tokens used: {response.usage.total_tokens}")
+            logger.info("📊 OpenAI tokens used: %d", response.usage.total_tokens)
 
             return analysis
 
         except json.JSONDecodeError as e:
-            logger.error(f"❌ Failed to parse AI response as JSON: {str(e)}")
+            logger.error("❌ Failed to parse AI response as JSON: %s", e)
             # Fallback to safe default
             return {
                 "recommendation": "NO-GO",
@@ -142,11 +171,12 @@ class OpenAIService:
                 "weather_summary": "Unable to analyze weather data",
                 "hazards": ["AI service error"],
                 "alternatives": ["Contact Flight Service (1-800-WX-BRIEF)"],
-                "confidence": "Low"
+                "confidence": "Low",
+                "fallback": True  # Not a real analysis; callers don't bill it
             }
 
         except Exception as e:
-            logger.error(f"❌ Weather analysis error: {str(e)}")
+            logger.error("❌ Weather analysis error: %s", e)
             raise
 
     async def get_coaching_response(
@@ -163,6 +193,9 @@ class OpenAIService:
 
         Returns:
             AI response text
+
+        Raises:
+            Exception: If the OpenAI call fails (callers decide on a fallback)
         """
         try:
             # Build prompt with context
@@ -170,8 +203,8 @@ class OpenAIService:
             if context:
                 prompt = f"Context: {json.dumps(context)}\n\nQuestion: {user_message}"
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._complete(
+                "coaching_chat",
                 messages=[
                     {"role": "system", "content": self.SAFETY_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
@@ -183,10 +216,10 @@ class OpenAIService:
             answer = response.choices[0].message.content
 
             # Log token usage
-            logger.info(f"📊 OpenAI tokens used: {response.usage.total_tokens}")
+            logger.info("📊 OpenAI tokens used: %d", response.usage.total_tokens)
 
             return answer
 
         except Exception as e:
-            logger.error(f"❌ Coaching chat error: {str(e)}")
-            return "I'm experiencing technical difficulties. Please try again in a moment."
+            logger.error("❌ Coaching chat error: %s", e)
+            raise
@@ -0,0 +1,289 @@
+# Quota Service
+# Per-user AI query quotas (Free 10 / Pro 100 / Ultimate unlimited per month)
+# Requirement: Subscription enforcement for GPT-4 backed coaching endpoints
+#
+# Quota checks are answered from in-memory sliding-window counters, so the
+# request path never waits on storage. Counters are flushed in the
+# background to a local JSON file and, when REDIS_URL is set, merged through
+# Redis so several backend instances share one view of usage.
+
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Monthly AI query limits per subscription tier (None = unlimited)
+TIER_LIMITS: Dict[str, Optional[int]] = {
+    "free": 10,
+    "pro": 100,
+    "ultimate": None,
+}
+
+DEFAULT_WINDOW_SECONDS = 30 * 24 * 3600  # "this month", as a rolling 30 days
+
+
+class SlidingWindowCounter:
+    """
+    Approximate sliding-window counter (two fixed windows, weighted)
+
+    The count for the trailing window is the current fixed window plus the
+    previous one scaled by how much of it still overlaps. O(1) time and space.
+    """
+
+    __slots__ = ("window", "current", "previous", "pending")
+
+    def __init__(self, window: int = 0, current: int = 0, previous: int = 0):
+        self.window = window      # Index of the current fixed window
+        self.current = current
+        self.previous = previous
+        self.pending = 0          # Hits not yet flushed to the shared store
+
+    def _roll(self, window: int):
+        if window == self.window:
+            return
+        self.previous = self.current if window == self.window + 1 else 0
+        self.current = 0
+        self.window = window
+
+    def count(self, now: float, window_seconds: int) -> float:
+        """Estimated hits in the trailing window ending at now"""
+        window, offset = divmod(now, window_seconds)
+        self._roll(int(window))
+        overlap = 1 - offset / window_seconds
+        return self.previous * overlap + self.current
+
+    def hit(self):
+        self.current += 1
+        self.pending += 1
+
+
+class QuotaService:
+    """In-memory AI quota enforcement with background persistence"""
+
+    def __init__(
+        self,
+        store_path: Optional[str] = None,
+        redis_url: Optional[str] = None,
+        flush_interval: float = 5.0,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS
+    ):
+        """Initialize quota service (paths/URLs default to environment)"""
+        self.store_path = store_path or os.getenv("AI_USAGE_STORE_PATH", "ai_usage.json")
+        self.redis_url = redis_url or os.getenv("REDIS_URL")
+        self.flush_interval = flush_interval
+        self.window_seconds = window_seconds
+
+        self.counters: Dict[str, SlidingWindowCounter] = {}
+        self.tiers: Dict[str, str] = {}
+        self._dirty = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._redis = None
+
+    def set_tier(self, user_id: str, tier: str):
+        """Record a user's subscription tier"""
+        if tier not in TIER_LIMITS:
+            raise ValueError(f"Unknown subscription tier: {tier}")
+        if self.tiers.get(user_id) != tier:
+            self.tiers[user_id] = tier
+            self._dirty.add(user_id)
+
+    def _counter(self, user_id: str) -> SlidingWindowCounter:
+        counter = self.counters.get(user_id)
+        if counter is None:
+            counter = SlidingWindowCounter()
+            self.counters[user_id] = counter
+        return counter
+
+    def consume(self, user_id: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check and consume one AI query for a user
+
+        Args:
+            user_id: User making the request
+
+        Returns:
+            (allowed, usage) where usage matches get_usage()
+        """
+        tier = self.tiers.get(user_id, "free")
+        limit = TIER_LIMITS[tier]
+        counter = self._counter(user_id)
+        used = counter.count(time.time(), self.window_seconds)
+
+        allowed = limit is None or used + 1 <= limit
+        if allowed:
+            counter.hit()
+            self._dirty.add(user_id)
+            used += 1
+
+        return allowed, self._usage(user_id, tier, limit, used)
+
+    def refund(self, user_id: str):
+        """Give back a query consumed by a request that then failed"""
+        counter = self.counters.get(user_id)
+        # If the window rolled over since consume(), the hit is already gone
+        if counter is None or counter.current <= 0:
+            return
+        counter.current -= 1
+        counter.pending -= 1
+        self._dirty.add(user_id)
+
+    def get_usage(self, user_id: str) -> Dict[str, Any]:
+        """Current usage statistics for a user (read-only: unknown users aren't tracked)"""
+        tier = self.tiers.get(user_id, "free")
+        limit = TIER_LIMITS[tier]
+        counter = self.counters.get(user_id)
+        used = counter.count(time.time(), self.window_seconds) if counter else 0
+        return self._usage(user_id, tier, limit, used)
+
+    def _usage(self, user_id: str, tier: str, limit: Optional[int], used: float) -> Dict[str, Any]:
+        queries = int(round(used))
+        return {
+            "user_id": user_id,
+            "queries_this_month": queries,
+            "queries_remaining": None if limit is None else max(0, limit - queries),
+            "subscription_tier": tier,
+            "limit": limit
+        }
+
+    # --- Persistence -------------------------------------------------------
+
+    async def start(self):
+        """Load persisted counters and start the background flusher"""
+        await asyncio.to_thread(self._load)
+
+        if self.redis_url:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(self.redis_url)
+                logger.info("✅ AI quota sync via Redis enabled")
+            except ImportError:
+                logger.warning("⚠️ REDIS_URL set but redis package not installed - quota sync disabled")
+
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the background flusher and write final counters"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        await self.flush()
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("❌ AI quota flush failed: %s", e)
+
+    def _prune(self, now: float) -> int:
+        """
+        Drop counters two or more windows old (their count is 0)
+
+        Tiers go with them: routes re-apply the tier from the caller's
+        token on every request, so only users with live counters need one.
+
+        Returns:
+            Number of counters dropped
+        """
+        oldest_live = int(now // self.window_seconds) - 1
+        stale = [user_id for user_id, counter in self.counters.items() if counter.window < oldest_live]
+        for user_id in stale:
+            del self.counters[user_id]
+            self._dirty.discard(user_id)
+        for user_id in [user_id for user_id in self.tiers if user_id not in self.counters]:
+            del self.tiers[user_id]
+            self._dirty.discard(user_id)
+        return len(stale)
+
+    async def flush(self):
+        """Persist live counters if any changed (or expired) since the last flush"""
+        pruned = self._prune(time.time())
+        if not self._dirty and not pruned:
+            return
+        dirty, self._dirty = self._dirty, set()
+
+        if self._redis is not None and dirty:
+            await self._sync_redis(dirty)
+
+        snapshot = {
+            user_id: {
+                "tier": self.tiers.get(user_id, "free"),
+                "window": counter.window,
+                "current": counter.current,
+                "previous": counter.previous
+            }
+            for user_id, counter in self.counters.items()
+        }
+
+        await asyncio.to_thread(self._write, snapshot)
+
+    async def _sync_redis(self, user_ids):
+        """Push local hits to Redis and adopt the shared totals"""
+        pipe = self._redis.pipeline()
+        synced = []
+        for user_id in user_ids:
+            counter = self.counters.get(user_id)
+            if counter is None:
+                continue
+            delta, counter.pending = counter.pending, 0
+            key = f"ai_quota:{user_id}:{counter.window}"
+            pipe.incrby(key, delta)
+            pipe.expire(key, 2 * self.window_seconds)
+            pipe.get(f"ai_quota:{user_id}:{counter.window - 1}")
+            synced.append((user_id, counter, counter.window, delta))
+
+        try:
+            results = await pipe.execute()
+        except Exception as e:
+            # Keep the hits so the next flush retries them
+            for _, counter, _, delta in synced:
+                counter.pending += delta
+            self._dirty.update(user_id for user_id, *_ in synced)
+            logger.error("❌ AI quota Redis sync failed: %s", e)
+            return
+
+        for i, (user_id, counter, window, _) in enumerate(synced):
+            total, _, previous = results[3 * i: 3 * i + 3]
+            if counter.window != window:
+                continue
+            # Hits that arrived while the pipeline was in flight stay pending
+            counter.current = int(total) + counter.pending
+            counter.previous = max(counter.previous, int(previous or 0))
+
+    def _load(self):
+        if not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("❌ Could not load AI usage from %s: %s", self.store_path, e)
+            return
+
+        for user_id, entry in data.items():
+            if entry.get("tier") in TIER_LIMITS:
+                self.tiers[user_id] = entry["tier"]
+            self.counters[user_id] = SlidingWindowCounter(
+                entry.get("window", 0), entry.get("current", 0), entry.get("previous", 0)
+            )
+        self._prune(time.time())
+        logger.info("📦 Loaded AI usage for %d users", len(self.counters))
+
+    def _write(self, snapshot: Dict[str, Any]):
+        tmp_path = f"{self.store_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.store_path)
@@ -0,0 +1,165 @@
+# Fast Responses
+# orjson-backed JSON responses and gzip/brotli compression for large payloads
+# Requirement: Dustin's Feature #3 - engine data and trends for long flights
+#
+# FastJSONResponse is opt-in: endpoints that serve trusted internal data
+# (dicts we built ourselves) return it directly, which skips FastAPI's
+# response_model re-validation and jsonable_encoder walk. orjson encodes
+# datetimes, UUIDs and Pydantic models natively.
+#
+# CompressionMiddleware only touches complete (non-streaming) bodies above
+# a size threshold, so small responses pay nothing.
+
+import gzip
+import json
+import asyncio
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from services.metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Bodies smaller than this are sent as-is (compression overhead > savings)
+DEFAULT_MINIMUM_SIZE = 1024
+# Bodies larger than this are compressed in a worker thread, off the event loop
+THREAD_THRESHOLD = 256 * 1024
+
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4  # Fast setting; still smaller than gzip for JSON
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (no response_model re-validation)
+
+    Starlette renders the body when the response is constructed, inside the
+    endpoint, so the encode is timed here as the "serialization" stage.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with metrics.time_stage("serialization"):
+            return dumps(content)
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the client's highest-q coding we support; ties prefer br (if available) over gzip"""
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    # "*" covers codings not listed explicitly; an explicit q=0 still refuses
+    wildcard = qualities.get("*", 0.0)
+    supported = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_quality = None, 0.0
+    for coding in supported:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware negotiating brotli/gzip for large responses"""
+
+    def __init__(self, app, minimum_size: int = DEFAULT_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = _choose_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            headers = start_message.get("headers", [])
+            already_encoded = any(name == b"content-encoding" for name, _ in headers)
+
+            # Streaming responses and small or pre-encoded bodies go out untouched
+            if message.get("more_body", False) or len(body) < self.minimum_size or already_encoded:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) > THREAD_THRESHOLD:
+                compressed = await asyncio.to_thread(_compress, body, encoding)
+            else:
+                compressed = _compress(body, encoding)
+
+            vary = b", ".join(value for name, value in headers if name == b"vary")
+            headers = [(name, value) for name, value in headers if name not in (b"content-length", b"vary")]
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,178 @@
+# Station Index Service
+# Nearest weather-reporting stations for a lat/lon (enroute weather)
+# Requirement: Dustin's Feature #2 - weather where the pilot actually is
+#
+# Stations are loaded once from a local list and indexed in a KD-tree over
+# unit-sphere (x, y, z) coordinates. Straight-line (chord) distance there is
+# monotonic with great-circle distance, so nearest-neighbour and radius
+# queries are exact and visit only O(log n) nodes instead of every station.
+
+import os
+import csv
+import json
+import math
+import heapq
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_NM = 3440.065
+DEFAULT_STATIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "stations.csv")
+
+
+def _to_xyz(lat: float, lon: float) -> Tuple[float, float, float]:
+    lat_r, lon_r = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat_r)
+    return (cos_lat * math.cos(lon_r), cos_lat * math.sin(lon_r), math.sin(lat_r))
+
+
+def _chord_to_nm(chord: float) -> float:
+    return 2 * math.asin(min(1.0, chord / 2)) * EARTH_RADIUS_NM
+
+
+def _nm_to_chord(distance_nm: float) -> float:
+    return 2 * math.sin(min(math.pi, distance_nm / EARTH_RADIUS_NM) / 2)
+
+
+class StationIndex:
+    """KD-tree index over weather stations"""
+
+    def __init__(self, stations: List[Dict[str, Any]]):
+        """
+        Build the index
+
+        Args:
+            stations: Dicts with icao, name, lat, lon
+        """
+        self.stations = stations
+        points = [(_to_xyz(s["lat"], s["lon"]), i) for i, s in enumerate(stations)]
+        # Node: (point, station index, axis, left, right)
+        self._root = self._build(points, 0)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "StationIndex":
+        """
+        Load stations from CSV (icao,name,lat,lon) or JSON
+
+        JSON may be a list of station objects using either our keys or the
+        aviationweather.gov station cache keys (icaoId, site, lat, lon).
+        Defaults to WEATHER_STATIONS_PATH, then the bundled data/stations.csv.
+        """
+        path = path or os.getenv("WEATHER_STATIONS_PATH") or DEFAULT_STATIONS_PATH
+        stations = []
+
+        try:
+            with open(path, newline="") as f:
+                if path.endswith(".json"):
+                    rows = json.load(f)
+                else:
+                    rows = list(csv.DictReader(f))
+        except (OSError, ValueError) as e:
+            logger.error("❌ Could not load weather stations from %s: %s", path, e)
+            return cls([])
+
+        for row in rows:
+            icao = row.get("icao") or row.get("icaoId")
+            try:
+                lat, lon = float(row["lat"]), float(row["lon"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if icao:
+                stations.append({"icao": icao.upper(), "name": row.get("name") or row.get("site") or icao,
+                                 "lat": lat, "lon": lon})
+
+        logger.info("🗺️ Indexed %d weather stations", len(stations))
+        return cls(stations)
+
+    def _build(self, points: list, depth: int):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        point, index = points[mid]
+        return (point, index, axis,
+                self._build(points[:mid], depth + 1),
+                self._build(points[mid + 1:], depth + 1))
+
+    def nearest(self, lat: float, lon: float, k: int = 3, max_distance_nm: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        k nearest stations to a position
+
+        Args:
+            lat, lon: Position in degrees
+            k: Number of stations
+            max_distance_nm: Optional cutoff in nautical miles
+
+        Returns:
+            Station dicts with distance_nm, closest first
+        """
+        if k <= 0 or self._root is None:
+            return []
+
+        target = _to_xyz(lat, lon)
+        limit_sq = _nm_to_chord(max_distance_nm) ** 2 if max_distance_nm is not None else math.inf
+        heap: List[Tuple[float, int]] = []  # max-heap of (-dist_sq, station index)
+
+        def bound_sq() -> float:
+            return -heap[0][0] if len(heap) == k else limit_sq
+
+        # (node, lower bound on squared distance to anything in its subtree)
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, min_sq = stack.pop()
+            if node is None or min_sq > bound_sq():
+                continue
+            point, index, axis, left, right = node
+
+            dist_sq = ((point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+                       + (point[2] - target[2]) ** 2)
+            if dist_sq <= limit_sq:
+                if len(heap) < k:
+                    heapq.heappush(heap, (-dist_sq, index))
+                elif dist_sq < -heap[0][0]:
+                    heapq.heapreplace(heap, (-dist_sq, index))
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Far side goes on the stack first so the near side is explored first
+            stack.append((far, diff * diff))
+            stack.append((near, min_sq))
+
+        results = sorted((-neg, index) for neg, index in heap)
+        return [self._result(index, dist_sq) for dist_sq, index in results]
+
+    def within_radius(self, lat: float, lon: float, radius_nm: float) -> List[Dict[str, Any]]:
+        """All stations within radius_nm of a position, closest first"""
+        if self._root is None:
+            return []
+
+        target = _to_xyz(lat, lon)
+        limit_sq = _nm_to_chord(radius_nm) ** 2
+        found = []
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, index, axis, left, right = node
+
+            dist_sq = ((point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+                       + (point[2] - target[2]) ** 2)
+            if dist_sq <= limit_sq:
+                found.append((dist_sq, index))
+
+            diff = target[axis] - point[axis]
+            if diff <= 0 or diff * diff <= limit_sq:
+                stack.append(left)
+            if diff >= 0 or diff * diff <= limit_sq:
+                stack.append(right)
+
+        found.sort()
+        return [self._result(index, dist_sq) for dist_sq, index in found]
+
+    def _result(self, index: int, dist_sq: float) -> Dict[str, Any]:
+        station = self.stations[index]
+        return {**station, "distance_nm": round(_chord_to_nm(math.sqrt(dist_sq)), 1)}
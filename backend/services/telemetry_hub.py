@@ -0,0 +1,208 @@
+# Telemetry Hub Service
+# Live fan-out of engine telemetry to connected WebSocket viewers
+# Requirement: In-flight engine monitoring (pilot + instructor views)
+#
+# Messages are serialized once per publish and handed to each viewer's
+# bounded queue. A slow viewer drops its oldest pending messages instead of
+# stalling the publisher or growing memory without limit.
+
+from typing import Dict, Any, Set, Optional, Callable
+from collections import deque
+from datetime import datetime
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """Serialize a hub message to JSON text"""
+    return json.dumps(message, default=_json_default)
+
+
+class RollingAggregates:
+    """
+    Running and windowed statistics per engine parameter
+
+    Each sample updates the statistics in O(1): totals for the whole flight,
+    plus a fixed-size window with a running sum for the recent average.
+    """
+
+    def __init__(self, window: int = 10):
+        """Initialize aggregates with the rolling window size (samples)"""
+        self.window = window
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def update(self, sample: Dict[str, Any], parameters) -> Dict[str, Dict[str, float]]:
+        """
+        Fold one sample into the aggregates
+
+        Args:
+            sample: Engine data point dict
+            parameters: Parameter names to aggregate
+
+        Returns:
+            Updated aggregates for the parameters present in the sample
+        """
+        changed = {}
+        for parameter in parameters:
+            value = sample.get(parameter)
+            if value is None:
+                continue
+
+            stats = self._stats.get(parameter)
+            if stats is None:
+                stats = {"count": 0, "total": 0.0, "min": value, "max": value,
+                         "recent": deque(), "recent_total": 0.0}
+                self._stats[parameter] = stats
+
+            stats["count"] += 1
+            stats["total"] += value
+            stats["min"] = min(stats["min"], value)
+            stats["max"] = max(stats["max"], value)
+
+            recent = stats["recent"]
+            recent.append(value)
+            stats["recent_total"] += value
+            if len(recent) > self.window:
+                stats["recent_total"] -= recent.popleft()
+
+            changed[parameter] = self._summary(stats)
+        return changed
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current aggregates for every parameter seen so far"""
+        return {parameter: self._summary(stats) for parameter, stats in self._stats.items()}
+
+    @staticmethod
+    def _summary(stats: Dict[str, Any]) -> Dict[str, float]:
+        recent = stats["recent"]
+        return {
+            "count": stats["count"],
+            "average": stats["total"] / stats["count"],
+            "min": stats["min"],
+            "max": stats["max"],
+            "latest": recent[-1],
+            "rolling_average": stats["recent_total"] / len(recent)
+        }
+
+
+class Subscriber:
+    """One connected viewer with a bounded outbound queue"""
+
+    def __init__(
+        self,
+        websocket,
+        max_queue: int = 64,
+        on_send_failed: Optional[Callable[["Subscriber"], None]] = None
+    ):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.task: Optional[asyncio.Task] = None
+        self.on_send_failed = on_send_failed
+
+    def offer(self, text: str):
+        """Enqueue without blocking; drop the oldest message when full"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(text)
+
+    def start(self) -> asyncio.Task:
+        """Start draining the queue to the socket in a background task"""
+        self.task = asyncio.create_task(self.run())
+        return self.task
+
+    async def run(self):
+        """Drain the queue to the socket until cancelled or disconnected"""
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+        except Exception as e:
+            # Peer vanished: stop receiving publishes and close our side
+            logger.info("🔌 Live viewer send failed, disconnecting: %s", e)
+            if self.on_send_failed is not None:
+                self.on_send_failed(self)
+            try:
+                await self.websocket.close(code=1011)
+            except Exception:
+                pass  # Already closed
+
+    async def close(self, code: int):
+        """Stop the sender, deliver what's still queued and close the socket"""
+        if self.task is not None:
+            self.task.cancel()
+        try:
+            while not self.queue.empty():
+                await self.websocket.send_text(self.queue.get_nowait())
+            await self.websocket.close(code=code)
+        except Exception:
+            pass  # Viewer already disconnected
+
+
+class TelemetryHub:
+    """Per-flight registry of live viewers"""
+
+    def __init__(self, max_queue: int = 64):
+        """Initialize hub with the per-connection queue bound"""
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+
+    def subscribe(self, flight_id: str, websocket) -> Subscriber:
+        """Register a viewer for a flight"""
+        subscriber = Subscriber(
+            websocket, self.max_queue,
+            on_send_failed=lambda failed: self.unsubscribe(flight_id, failed)
+        )
+        self._subscribers.setdefault(flight_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, flight_id: str, subscriber: Subscriber):
+        """Remove a viewer; logs how many messages it missed"""
+        subscribers = self._subscribers.get(flight_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[flight_id]
+        if subscriber.dropped:
+            logger.warning("⚠️ Live viewer on flight %s dropped %d messages", flight_id, subscriber.dropped)
+
+    def publish(self, flight_id: str, message: Dict[str, Any]) -> int:
+        """
+        Fan a message out to every viewer of a flight
+
+        Args:
+            flight_id: Flight to publish to
+            message: JSON-serializable message dict
+
+        Returns:
+            Number of viewers the message was queued for
+        """
+        subscribers = self._subscribers.get(flight_id)
+        if not subscribers:
+            return 0
+
+        text = encode_message(message)
+        for subscriber in subscribers:
+            subscriber.offer(text)
+        return len(subscribers)
+
+    def viewer_count(self, flight_id: str) -> int:
+        """Number of viewers connected to a flight"""
+        return len(self._subscribers.get(flight_id, ()))
+
+    async def close_flight(self, flight_id: str, code: int = 4404):
+        """Disconnect all viewers of a deleted flight (4404 = flight not found)"""
+        subscribers = self._subscribers.pop(flight_id, None)
+        if subscribers:
+            await asyncio.gather(*(subscriber.close(code) for subscriber in subscribers))
@@ -2,10 +2,13 @@
 # Fetches METARs/TAFs from NOAA Aviation Weather Center
 # Built by Byte (Backend Agent) - Day 6-7
 
+import os
+import asyncio
 import aiohttp
-from typing import Optional
+from typing import Optional, Dict, List
 import logging
 from datetime import datetime, timedelta
+from services.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,7 @@ class WeatherService:
 
     def __init__(self):
         """Initialize weather service"""
-        self.base_url = "https://aviationweather.gov/api/data"
+        self.base_url = os.getenv("AVIATION_WEATHER_API_URL", "https://aviationweather.gov/api/data")
         self.cache = {}  # Simple in-memory cache
         self.cache_duration = timedelta(minutes=30)  # Dustin's offline requirement
 
@@ -30,11 +33,14 @@ class WeatherService:
         """
         # Check cache first (30-minute cache for offline support)
         cache_key = f"metar_{airport_code}"
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if datetime.now() - cached_time < self.cache_duration:
-                logger.info(f"📦 Using cached METAR for {airport_code}")
-                return cached_data
+        with metrics.time_stage("weather_cache_lookup"):
+            cached = self.cache.get(cache_key)
+            fresh = cached is not None and datetime.now() - cached[1] < self.cache_duration
+        if fresh:
+            metrics.cache_lookups.inc("metar", "hit")
+            logger.info("📦 Using cached METAR for %s", airport_code, extra={"log_type": "weather_cache_hit"})
+            return cached[0]
+        metrics.cache_lookups.inc("metar", "miss")
 
         try:
             # Fetch from NOAA API
@@ -46,38 +52,134 @@ class WeatherService:
                 "hours": "2"  # Last 2 hours
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=5) as response:
-                    if response.status == 200:
-                        metar_text = await response.text()
-
-                        # Parse response (returns raw METAR text)
-                        if metar_text and airport_code in metar_text:
-                            # Cache the result
-                            self.cache[cache_key] = (metar_text.strip(), datetime.now())
-                            logger.info(f"✅ Fetched METAR for {airport_code}")
-                            return metar_text.strip()
-                        else:
-                            logger.warning(f"⚠️ No METAR found for {airport_code}")
-                            return None
-                    else:
-                        logger.error(f"❌ METAR fetch failed: HTTP {response.status}")
-                        return None
-
-        except aiohttp.ClientError as e:
-            logger.error(f"❌ Network error fetching METAR: {str(e)}")
+            with metrics.time_stage("noaa_fetch"):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, params=params, timeout=5) as response:
+                        status = response.status
+                        metar_text = await response.text() if status == 200 else None
+
+            if status != 200:
+                metrics.upstream_errors.inc("noaa", f"http_{status}")
+                logger.error("❌ METAR fetch failed: HTTP %d", status)
+                return None
+
+            # Parse response (returns raw METAR text)
+            with metrics.time_stage("metar_decode"):
+                metar = metar_text.strip() if metar_text and airport_code in metar_text else None
+
+            if metar:
+                # Cache the result
+                self.cache[cache_key] = (metar, datetime.now())
+                logger.info("✅ Fetched METAR for %s", airport_code)
+                return metar
+            else:
+                metrics.upstream_errors.inc("noaa", "no_data")
+                logger.warning("⚠️ No METAR found for %s", airport_code)
+                return None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            metrics.upstream_errors.inc("noaa", "network")
+            logger.error("❌ Network error fetching METAR: %s", e)
             # Return cached data even if expired (graceful degradation)
             if cache_key in self.cache:
                 cached_data, cached_time = self.cache[cache_key]
                 age_minutes = int((datetime.now() - cached_time).total_seconds() / 60)
-                logger.warning(f"⚠️ Using stale METAR ({age_minutes} min old)")
+                metrics.cache_lookups.inc("metar", "stale")
+                logger.warning("⚠️ Using stale METAR (%d min old)", age_minutes)
                 return f"{cached_data} [CACHED {age_minutes}m ago]"
             return None
 
         except Exception as e:
-            logger.error(f"❌ Unexpected error fetching METAR: {str(e)}")
+            metrics.upstream_errors.inc("noaa", "unexpected")
+            logger.error("❌ Unexpected error fetching METAR: %s", e)
             return None
 
+    async def get_metars(self, airport_codes: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Fetch current METARs for several airports with at most one NOAA request
+
+        Cached stations are answered locally; the rest are requested together
+        as a comma-separated ids list.
+
+        Args:
+            airport_codes: ICAO airport codes
+
+        Returns:
+            Dict of airport code -> METAR string (None if unavailable)
+        """
+        results: Dict[str, Optional[str]] = {}
+        missing = []
+        now = datetime.now()
+
+        with metrics.time_stage("weather_cache_lookup"):
+            for code in airport_codes:
+                cached = self.cache.get(f"metar_{code}")
+                if cached is not None and now - cached[1] < self.cache_duration:
+                    results[code] = cached[0]
+                else:
+                    missing.append(code)
+        if results:
+            metrics.cache_lookups.inc("metar", "hit", amount=len(results))
+            logger.info("📦 Using cached METARs for %s", ", ".join(results), extra={"log_type": "weather_cache_hit"})
+        if not missing:
+            return results
+        metrics.cache_lookups.inc("metar", "miss", amount=len(missing))
+
+        try:
+            params = {
+                "ids": ",".join(missing),
+                "format": "raw",
+                "taf": "false",
+                "hours": "2"
+            }
+
+            with metrics.time_stage("noaa_fetch"):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(f"{self.base_url}/metar", params=params, timeout=5) as response:
+                        status = response.status
+                        metar_text = await response.text() if status == 200 else None
+
+            if status != 200:
+                metrics.upstream_errors.inc("noaa", f"http_{status}")
+                logger.error("❌ METAR batch fetch failed: HTTP %d", status)
+                metar_text = ""
+
+            # Raw output is one report per line, newest first
+            with metrics.time_stage("metar_decode"):
+                wanted = set(missing)
+                for line in metar_text.splitlines():
+                    parts = line.split()
+                    if not parts:
+                        continue
+                    code = parts[1] if parts[0] in ("METAR", "SPECI") and len(parts) > 1 else parts[0]
+                    if code in wanted and code not in results:
+                        results[code] = line.strip()
+                        self.cache[f"metar_{code}"] = (line.strip(), now)
+
+            logger.info("✅ Fetched %d/%d METARs in one request", len(wanted & results.keys()), len(missing))
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            metrics.upstream_errors.inc("noaa", "network")
+            logger.error("❌ Network error fetching METARs: %s", e)
+
+        except Exception as e:
+            metrics.upstream_errors.inc("noaa", "unexpected")
+            logger.error("❌ Unexpected error fetching METARs: %s", e)
+
+        # Fall back to stale cache entries (graceful degradation)
+        for code in missing:
+            if code in results:
+                continue
+            cached = self.cache.get(f"metar_{code}")
+            if cached is not None:
+                age_minutes = int((now - cached[1]).total_seconds() / 60)
+                metrics.cache_lookups.inc("metar", "stale")
+                results[code] = f"{cached[0]} [CACHED {age_minutes}m ago]"
+            else:
+                results[code] = None
+
+        return results
+
     async def get_taf(self, airport_code: str) -> Optional[str]:
         """
         Fetch Terminal Area Forecast (TAF) for an airport
@@ -89,10 +191,13 @@ class WeatherService:
             TAF string or None if unavailable
         """
         cache_key = f"taf_{airport_code}"
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if datetime.now() - cached_time < self.cache_duration:
-                return cached_data
+        with metrics.time_stage("weather_cache_lookup"):
+            cached = self.cache.get(cache_key)
+            fresh = cached is not None and datetime.now() - cached[1] < self.cache_duration
+        if fresh:
+            metrics.cache_lookups.inc("taf", "hit")
+            return cached[0]
+        metrics.cache_lookups.inc("taf", "miss")
 
         try:
             url = f"{self.base_url}/taf"
@@ -101,23 +206,28 @@ class WeatherService:
                 "format": "raw"
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=5) as response:
-                    if response.status == 200:
-                        taf_text = await response.text()
-
-                        if taf_text and airport_code in taf_text:
-                            self.cache[cache_key] = (taf_text.strip(), datetime.now())
-                            logger.info(f"✅ Fetched TAF for {airport_code}")
-                            return taf_text.strip()
-                        else:
-                            logger.warning(f"⚠️ No TAF found for {airport_code}")
-                            return None
-                    else:
-                        return None
+            with metrics.time_stage("noaa_fetch"):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, params=params, timeout=5) as response:
+                        status = response.status
+                        taf_text = await response.text() if status == 200 else None
+
+            if status != 200:
+                metrics.upstream_errors.inc("noaa", f"http_{status}")
+                return None
+
+            if taf_text and airport_code in taf_text:
+                self.cache[cache_key] = (taf_text.strip(), datetime.now())
+                logger.info("✅ Fetched TAF for %s", airport_code)
+                return taf_text.strip()
+            else:
+                metrics.upstream_errors.inc("noaa", "no_data")
+                logger.warning("⚠️ No TAF found for %s", airport_code)
+                return None
 
         except Exception as e:
-            logger.error(f"❌ Error fetching TAF: {str(e)}")
+            metrics.upstream_errors.inc("noaa", "network" if isinstance(e, aiohttp.ClientError) else "unexpected")
+            logger.error("❌ Error fetching TAF: %s", e)
             # Graceful degradation
             if cache_key in self.cache:
                 cached_data, _ = self.cache[cache_key]
@@ -0,0 +1,70 @@
+# Test fixtures
+# Locally generated Apple signing keys and an AuthService wired to them
+
+import os
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+# Routers build their services at import time; keep them offline
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+from services.auth_service import AuthService, AppleKeySet, APPLE_ISSUER  # noqa: E402
+
+APPLE_CLIENT_ID = "com.msrresearch.guardianone"
+KEY_ID = "test-key-1"
+
+
+@pytest.fixture(scope="session")
+def apple_private_key() -> bytes:
+    """Locally generated RSA key standing in for Apple's signing key"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+
+
+@pytest.fixture(scope="session")
+def apple_public_jwk(apple_private_key: bytes) -> dict:
+    private_key = serialization.load_pem_private_key(apple_private_key, password=None)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update(kid=KEY_ID, alg="RS256", use="sig")
+    return public_jwk
+
+
+@pytest.fixture
+def apple_keys(apple_public_jwk: dict) -> AppleKeySet:
+    """Key set preloaded with the local key; never fetches from the network"""
+    keys = AppleKeySet(keys_url="http://127.0.0.1:9/unused", min_refetch_interval=3600)
+    keys.keys = {KEY_ID: apple_public_jwk}
+    keys.fetched_at = time.monotonic()
+    return keys
+
+
+@pytest.fixture
+def auth_service(apple_keys: AppleKeySet) -> AuthService:
+    return AuthService(secret="test-secret", apple_client_id=APPLE_CLIENT_ID, apple_keys=apple_keys)
+
+
+@pytest.fixture
+def make_apple_token(apple_private_key: bytes):
+    """Build an Apple-style identity token; overrides replace default claims"""
+    def build(kid: str = KEY_ID, **overrides) -> str:
+        claims = {
+            "iss": APPLE_ISSUER,
+            "aud": APPLE_CLIENT_ID,
+            "sub": "apple-user-001",
+            "email": "pilot@example.com",
+            "iat": int(time.time()),
+            "exp": int(time.time()) + 600,
+        }
+        claims.update(overrides)
+        return jwt.encode(claims, apple_private_key, algorithm="RS256", headers={"kid": kid})
+    return build
@@ -0,0 +1,110 @@
+# Auth Router Tests
+# Apple Sign-In, refresh token rotation and logout revocation over HTTP
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import auth
+
+
+@pytest.fixture
+def client(auth_service, monkeypatch):
+    monkeypatch.setattr(auth, "auth_service", auth_service)
+    monkeypatch.setattr(auth, "users_db", {})
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    return TestClient(app)
+
+
+def sign_in(client, make_apple_token, sub="apple-user-001"):
+    response = client.post("/api/auth/apple-signin", json={
+        "identity_token": make_apple_token(sub=sub),
+        "authorization_code": "code",
+        "user_identifier": sub
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_apple_signin_creates_user_once(client, make_apple_token):
+    first = sign_in(client, make_apple_token)
+    second = sign_in(client, make_apple_token)
+
+    assert first["user_id"] == second["user_id"]
+    assert first["subscription_tier"] == "free"
+    assert first["token_type"] == "bearer"
+    assert len(auth.users_db) == 1
+
+
+def test_apple_signin_rejects_mismatched_user_identifier(client, make_apple_token):
+    response = client.post("/api/auth/apple-signin", json={
+        "identity_token": make_apple_token(sub="apple-user-001"),
+        "authorization_code": "code",
+        "user_identifier": "someone-else"
+    })
+
+    assert response.status_code == 401
+
+
+def test_apple_signin_rejects_wrong_audience(client, make_apple_token):
+    response = client.post("/api/auth/apple-signin", json={
+        "identity_token": make_apple_token(aud="com.example.otherapp"),
+        "authorization_code": "code",
+        "user_identifier": "apple-user-001"
+    })
+
+    assert response.status_code == 401
+
+
+def test_refresh_rotates_token_pair(client, make_apple_token):
+    tokens = sign_in(client, make_apple_token)
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["user_id"] == tokens["user_id"]
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert rotated["access_token"] != tokens["access_token"]
+
+
+def test_refresh_token_reuse_is_rejected(client, make_apple_token):
+    tokens = sign_in(client, make_apple_token)
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 401
+    assert "revoked" in response.json()["detail"]
+
+
+def test_refresh_rejects_access_token(client, make_apple_token):
+    tokens = sign_in(client, make_apple_token)
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["access_token"]})
+
+    assert response.status_code == 401
+
+
+def test_logout_revokes_access_and_refresh_tokens(client, make_apple_token):
+    tokens = sign_in(client, make_apple_token)
+
+    response = client.post(
+        "/api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=bearer(tokens["access_token"])
+    )
+    assert response.status_code == 200
+
+    assert client.post("/api/auth/logout", headers=bearer(tokens["access_token"])).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_logout_requires_token(client):
+    assert client.post("/api/auth/logout").status_code == 401
@@ -0,0 +1,116 @@
+# Auth Service Tests
+# Apple identity token verification and Guardian One JWT verification/revocation
+
+import asyncio
+
+import pytest
+
+from services import auth_service as auth_module
+from services.auth_service import AuthError
+
+
+def test_verify_apple_token_accepts_locally_signed_token(auth_service, make_apple_token):
+    claims = asyncio.run(auth_service.verify_apple_token(make_apple_token()))
+
+    assert claims["sub"] == "apple-user-001"
+    assert claims["email"] == "pilot@example.com"
+
+
+def test_verify_apple_token_rejects_wrong_audience(auth_service, make_apple_token):
+    token = make_apple_token(aud="com.example.otherapp")
+
+    with pytest.raises(AuthError, match="Invalid identity token"):
+        asyncio.run(auth_service.verify_apple_token(token))
+
+
+def test_verify_apple_token_rejects_wrong_issuer(auth_service, make_apple_token):
+    token = make_apple_token(iss="https://evil.example.com")
+
+    with pytest.raises(AuthError, match="Invalid identity token"):
+        asyncio.run(auth_service.verify_apple_token(token))
+
+
+def test_verify_apple_token_rejects_unknown_kid(auth_service, make_apple_token):
+    token = make_apple_token(kid="not-an-apple-key")
+
+    with pytest.raises(AuthError, match="Unknown identity token signing key"):
+        asyncio.run(auth_service.verify_apple_token(token))
+
+
+def test_verify_apple_token_rejects_expired_token(auth_service, make_apple_token):
+    token = make_apple_token(exp=1)
+
+    with pytest.raises(AuthError):
+        asyncio.run(auth_service.verify_apple_token(token))
+
+
+def test_verify_token_returns_claims(auth_service):
+    tokens = auth_service.issue_tokens("user-1", "pro")
+
+    claims = auth_service.verify_token(tokens["access_token"])
+
+    assert claims["sub"] == "user-1"
+    assert claims["tier"] == "pro"
+    assert claims["type"] == "access"
+
+
+def test_verify_token_cache_hit_skips_decode(auth_service, monkeypatch):
+    token = auth_service.issue_tokens("user-1", "free")["access_token"]
+    auth_service.verify_token(token)
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("cached token was decoded again")
+    monkeypatch.setattr(auth_module.jwt, "decode", fail_decode)
+
+    assert auth_service.verify_token(token)["sub"] == "user-1"
+
+
+def test_verify_token_cache_hit_rechecks_expiry(auth_service, monkeypatch):
+    token = auth_service.issue_tokens("user-1", "free")["access_token"]
+    claims = auth_service.verify_token(token)
+
+    monkeypatch.setattr(auth_module.time, "time", lambda: claims["exp"] + 1)
+
+    with pytest.raises(AuthError, match="expired"):
+        auth_service.verify_token(token)
+    assert len(auth_service._verified) == 0
+
+
+def test_verify_token_rejects_wrong_type(auth_service):
+    tokens = auth_service.issue_tokens("user-1", "free")
+
+    with pytest.raises(AuthError, match="Expected access token"):
+        auth_service.verify_token(tokens["refresh_token"])
+    with pytest.raises(AuthError, match="Expected refresh token"):
+        auth_service.verify_token(tokens["access_token"], token_type="refresh")
+
+
+def test_verify_token_rejects_other_secret(auth_service):
+    other = auth_module.AuthService(secret="other-secret", apple_keys=auth_service.apple_keys)
+    token = other.issue_tokens("user-1", "free")["access_token"]
+
+    with pytest.raises(AuthError, match="Invalid token"):
+        auth_service.verify_token(token)
+
+
+def test_revoked_token_is_denied_even_when_cached(auth_service):
+    token = auth_service.issue_tokens("user-1", "free")["access_token"]
+    claims = auth_service.verify_token(token)
+
+    auth_service.revoke(claims)
+
+    with pytest.raises(AuthError, match="revoked"):
+        auth_service.verify_token(token)
+
+
+def test_denylist_prunes_expired_entries(auth_service, monkeypatch):
+    claims = auth_service.verify_token(auth_service.issue_tokens("user-1", "free")["access_token"])
+    auth_service.revoke(claims)
+
+    later = claims["exp"] + 1
+    monkeypatch.setattr(auth_module.time, "time", lambda: later)
+    auth_service._next_prune = 0
+    auth_service.revoke({"jti": "other", "exp": later + 600})
+
+    assert claims["jti"] not in auth_service._denylist
+    assert "other" in auth_service._denylist
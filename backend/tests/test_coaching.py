@@ -0,0 +1,143 @@
+# Coaching Router Tests
+# AI quota enforcement, enroute weather context and the station lookup endpoint
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import auth, coaching
+from services.quota_service import QuotaService
+from services.station_index import StationIndex
+
+
+@pytest.fixture
+def quota(monkeypatch, tmp_path):
+    service = QuotaService(store_path=str(tmp_path / "ai_usage.json"))
+    monkeypatch.setattr(coaching, "quota_service", service)
+    return service
+
+
+@pytest.fixture
+def client(quota, auth_service, monkeypatch):
+    monkeypatch.setattr(auth, "auth_service", auth_service)
+
+    async def answer(**kwargs):
+        return "Descend at 500 fpm."
+    monkeypatch.setattr(coaching.openai_service, "get_coaching_response", answer)
+
+    app = FastAPI()
+    app.include_router(coaching.router, prefix="/api/coaching")
+    return TestClient(app)
+
+
+def chat(client, **kwargs):
+    return client.post("/api/coaching/chat", json={"user_id": "u", "message": "Descent rate?"}, **kwargs)
+
+
+def test_anonymous_quota_ignores_client_supplied_user_id(client):
+    statuses = [chat(client, headers={"X-User-ID": f"user-{i}"}).status_code for i in range(12)]
+
+    assert statuses == [200] * 10 + [429] * 2
+
+
+def test_signed_in_user_is_keyed_on_token(client, auth_service):
+    token = auth_service.issue_tokens("user-1", "free")["access_token"]
+
+    response = chat(client, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "9"
+
+
+def test_failed_chat_is_refunded(client, quota, monkeypatch):
+    async def unavailable(**kwargs):
+        raise RuntimeError("OpenAI down")
+    monkeypatch.setattr(coaching.openai_service, "get_coaching_response", unavailable)
+
+    response = chat(client)
+
+    assert response.status_code == 200
+    assert response.json()["response"] == coaching.COACHING_FALLBACK
+    assert quota.get_usage("ip:testclient")["queries_this_month"] == 0
+
+
+def test_weather_outage_is_refunded(client, quota, monkeypatch):
+    async def no_weather(codes):
+        return {code: None for code in codes}
+    monkeypatch.setattr(coaching.weather_service, "get_metars", no_weather)
+
+    response = client.post("/api/coaching/weather-analysis", json={
+        "departure_airport": "KAUS",
+        "arrival_airport": "KSAT"
+    })
+
+    assert response.status_code == 503
+    assert quota.get_usage("ip:testclient")["queries_this_month"] == 0
+
+
+def test_usage_requires_own_token(client, auth_service):
+    token = auth_service.issue_tokens("user-1", "pro")["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/coaching/usage/user-1").status_code == 401
+    assert client.get("/api/coaching/usage/user-2", headers=headers).status_code == 403
+
+    usage = client.get("/api/coaching/usage/user-1", headers=headers).json()
+    assert usage["subscription_tier"] == "pro"
+    assert usage["queries_remaining"] == 100
+
+
+def test_usage_lookup_does_not_create_counters(quota):
+    for i in range(100):
+        quota.get_usage(f"unknown-{i}")
+
+    assert quota.counters == {}
+
+
+@pytest.fixture
+def stations(monkeypatch):
+    index = StationIndex([
+        {"icao": "KHYI", "name": "San Marcos Rgnl", "lat": 29.8928, "lon": -97.8631},
+        {"icao": "KBAZ", "name": "New Braunfels Natl", "lat": 29.7045, "lon": -98.0422},
+        {"icao": "KDFW", "name": "Dallas/Fort Worth Intl", "lat": 32.8968, "lon": -97.0380},
+    ])
+    monkeypatch.setattr(coaching, "station_index", index)
+    return index
+
+
+def test_weather_analysis_includes_nearby_metars(client, stations, monkeypatch):
+    requested, contexts = [], []
+
+    async def metars(codes):
+        requested.append(codes)
+        return {code: f"{code} 151853Z 18008KT 10SM FEW045 28/16 A3001" for code in codes}
+
+    async def analyze(context, custom_question=None):
+        contexts.append(context)
+        return {"recommendation": "GO", "reasoning": "VFR", "weather_summary": "VFR", "confidence": "High"}
+
+    monkeypatch.setattr(coaching.weather_service, "get_metars", metars)
+    monkeypatch.setattr(coaching.openai_service, "analyze_weather_decision", analyze)
+
+    response = client.post("/api/coaching/weather-analysis", json={
+        "departure_airport": "KAUS",
+        "arrival_airport": "KSAT",
+        "current_position": {"latitude": 29.85, "longitude": -97.9}
+    })
+
+    assert response.status_code == 200
+    assert requested == [["KAUS", "KSAT", "KHYI", "KBAZ"]]
+    enroute = contexts[0]["enroute_weather"]
+    assert [station["airport"] for station in enroute] == ["KHYI", "KBAZ"]
+    assert enroute[0]["metar"].startswith("KHYI")
+    assert enroute[0]["distance_nm"] < enroute[1]["distance_nm"]
+
+
+def test_nearby_stations_with_radius_only_returns_all_in_range(client, stations):
+    params = {"lat": 29.85, "lon": -97.9, "radius_nm": 300}
+
+    in_radius = client.get("/api/coaching/stations/nearby", params=params).json()["stations"]
+    nearest = client.get("/api/coaching/stations/nearby", params={**params, "k": 1}).json()["stations"]
+
+    assert [station["icao"] for station in in_radius] == ["KHYI", "KBAZ", "KDFW"]
+    assert [station["icao"] for station in nearest] == ["KHYI"]
@@ -0,0 +1,69 @@
+# Engine Monitor Tests
+# Rate-of-change and drift detectors on 1 Hz telemetry
+
+import random
+from datetime import datetime, timedelta
+
+from services.engine_monitor import DEFAULT_LIMITS, DriftDetector, EngineMonitor, RateOfChangeDetector
+
+STARTED = datetime(2026, 1, 1, 10, 0, 0)
+
+
+def cht_series(rate_per_min, minutes, noise=1.0, seed=3):
+    """CHT sampled at 1 Hz from 360 °F, rising at rate_per_min with gaussian noise"""
+    rng = random.Random(seed)
+    for second in range(minutes * 60):
+        value = 360 + rate_per_min * second / 60 + rng.gauss(0, noise)
+        yield STARTED + timedelta(seconds=second), value
+
+
+def test_rate_of_change_ignores_sample_noise():
+    detector = RateOfChangeDetector(DEFAULT_LIMITS["cht"])
+    alerts = [detector.update("cht", value, ts) for ts, value in cht_series(0, 60, noise=3.0)]
+
+    assert not any(alerts)
+
+
+def test_rate_of_change_alerts_once_per_ramp():
+    detector = RateOfChangeDetector(DEFAULT_LIMITS["cht"])
+    alerts = [detector.update("cht", value, ts) for ts, value in cht_series(80, 3)]
+
+    raised = [alert for alert in alerts if alert]
+    assert len(raised) == 1
+    assert raised[0]["detector"] == "rate_of_change"
+    assert "rising" in raised[0]["message"]
+
+
+def test_rate_of_change_restarts_window_on_out_of_order_sample():
+    detector = RateOfChangeDetector(DEFAULT_LIMITS["cht"])
+    detector.update("cht", 360, STARTED)
+
+    assert detector.update("cht", 300, STARTED - timedelta(minutes=5)) is None
+    assert detector.ref_value == 300
+
+
+def test_drift_flags_slow_creep_before_range_limit():
+    monitor = EngineMonitor()
+    first_alerts = {}
+    for ts, value in cht_series(2, 90):
+        for alert in monitor.observe("flight", {"timestamp": ts, "cht": value}):
+            first_alerts.setdefault(alert["detector"], alert)
+
+    assert "drift" in first_alerts
+    assert "increasing" in first_alerts["drift"]["message"]
+    assert first_alerts["drift"]["value"] < DEFAULT_LIMITS["cht"].high
+    assert "rate_of_change" not in first_alerts
+
+
+def test_drift_alerts_once_per_excursion():
+    detector = DriftDetector(DEFAULT_LIMITS["cht"])
+    alerts = [detector.update("cht", value, ts) for ts, value in cht_series(5, 20)]
+
+    assert len([alert for alert in alerts if alert]) == 1
+
+
+def test_drift_stays_quiet_on_steady_noise():
+    detector = DriftDetector(DEFAULT_LIMITS["cht"])
+    alerts = [detector.update("cht", value, ts) for ts, value in cht_series(0, 60)]
+
+    assert not any(alerts)
@@ -0,0 +1,116 @@
+# Flight Router Tests
+# Engine data ingest, anomaly alerts and live telemetry
+
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from routers import flights
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(flights.router, prefix="/api/flights")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def flight_id(client):
+    response = client.post("/api/flights/", json={
+        "departure_airport": "KAUS",
+        "arrival_airport": "KSAT",
+        "aircraft_type": "C172",
+        "departure_time": "2026-01-01T10:00:00"
+    })
+    assert response.status_code == 200
+    yield response.json()["id"]
+    client.delete(f"/api/flights/{response.json()['id']}")
+
+
+def test_aware_then_naive_default_timestamps_are_accepted(client, flight_id):
+    first = client.post(f"/api/flights/{flight_id}/engine-data", json={
+        "timestamp": "2026-01-01T12:00:00+02:00",
+        "cht": 360
+    })
+    second = client.post(f"/api/flights/{flight_id}/engine-data", json={"cht": 362})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    data_points = client.get(f"/api/flights/{flight_id}/engine-data").json()["data_points"]
+    assert data_points[0]["timestamp"] == "2026-01-01T10:00:00"
+    assert len(data_points) == 2
+
+
+def test_bulk_ingest_stores_alerts_per_point(client, flight_id):
+    response = client.post(f"/api/flights/{flight_id}/engine-data/bulk", json=[
+        {"timestamp": "2026-01-01T10:00:00", "cht": 510},
+        {"timestamp": "2026-01-01T10:01:00", "cht": 380},
+        {"timestamp": "2026-01-01T10:02:00", "cht": 520},
+    ])
+
+    assert response.status_code == 200
+    alerts = client.get(f"/api/flights/{flight_id}/alerts").json()
+    assert [alert["detector"] for alert in alerts if alert["detector"] == "range"] == ["range", "range"]
+    assert len(alerts) == len(response.json()["alerts"])
+
+
+def test_export_formats_use_utc_timestamps(client, flight_id):
+    client.post(f"/api/flights/{flight_id}/engine-data", json={
+        "timestamp": "2026-01-01T12:00:00+02:00",
+        "cht": 360
+    })
+
+    columnar = client.get(f"/api/flights/{flight_id}/export").json()
+    csv_text = client.get(f"/api/flights/{flight_id}/export", params={"format": "csv"}).text
+
+    assert columnar["columns"]["timestamp_ms"] == [1767261600000]
+    assert csv_text.splitlines()[1].startswith("2026-01-01T10:00:00Z,")
+    assert client.get(f"/api/flights/{flight_id}/export", params={"format": "xml"}).status_code == 422
+
+
+def test_live_channel_replies_to_malformed_frames(client, flight_id):
+    with client.websocket_connect(f"/api/flights/{flight_id}/live") as ws:
+        assert ws.receive_json()["type"] == "snapshot"
+
+        ws.send_text("not json")
+        assert ws.receive_json() == {"type": "error", "detail": "Message is not valid JSON"}
+
+        ws.send_json(["sample"])
+        assert ws.receive_json() == {"type": "error", "detail": "Unsupported message type"}
+
+        ws.send_json({"type": "sample", "data": "cht=400"})
+        assert ws.receive_json() == {"type": "error", "detail": "Sample data must be an object"}
+
+        ws.send_json({"type": "sample", "data": {"cht": 365}})
+        message = ws.receive_json()
+        assert message["type"] == "sample"
+        assert message["data_point"]["cht"] == 365
+
+
+def test_live_channel_closes_on_unexpected_error(client, flight_id, monkeypatch):
+    def broken_ingest(*args, **kwargs):
+        raise RuntimeError("storage unavailable")
+    monkeypatch.setattr(flights, "_ingest_engine_data", broken_ingest)
+
+    with client.websocket_connect(f"/api/flights/{flight_id}/live") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "sample", "data": {"cht": 365}})
+
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1011
+
+
+def test_deleting_flight_disconnects_live_viewers(client, flight_id):
+    with client.websocket_connect(f"/api/flights/{flight_id}/live") as ws:
+        ws.receive_json()
+
+        assert client.delete(f"/api/flights/{flight_id}").status_code == 200
+
+        assert ws.receive_json()["type"] == "flight_deleted"
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 4404
+    assert flights.telemetry_hub.viewer_count(flight_id) == 0
@@ -0,0 +1,66 @@
+# Logging Setup Tests
+# Queue-backed logging: listener lifecycle, sampling and off-thread formatting
+
+import io
+import logging
+import queue
+
+from services.logging_setup import NonBlockingQueueHandler, RestartableQueueListener, SamplingFilter
+
+
+def make_logger(name: str, log_queue: queue.Queue, handler: logging.Handler = None) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler or NonBlockingQueueHandler(log_queue)]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_listener_start_stop_are_idempotent_and_restartable():
+    log_queue: queue.Queue = queue.Queue()
+    stream = io.StringIO()
+    listener = RestartableQueueListener(log_queue, logging.StreamHandler(stream))
+    logger = make_logger("tests.listener", log_queue)
+
+    listener.start()
+    listener.start()
+    logger.info("first")
+    listener.stop()
+    listener.stop()
+
+    logger.info("second")
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == ["first", "second"]
+    assert not listener.running
+
+
+def test_sampling_filter_keeps_one_in_n_but_all_warnings():
+    sampling = SamplingFilter({"noisy": 10})
+    records = [
+        logging.LogRecord("tests", logging.INFO, __file__, 1, "hit", None, None) for _ in range(30)
+    ]
+    for record in records:
+        record.log_type = "noisy"
+    warning = logging.LogRecord("tests", logging.WARNING, __file__, 1, "warn", None, None)
+    warning.log_type = "noisy"
+
+    assert sum(sampling.filter(record) for record in records) == 3
+    assert sampling.filter(warning)
+
+
+def test_message_arguments_are_captured_at_log_time():
+    log_queue: queue.Queue = queue.Queue()
+    stream = io.StringIO()
+    listener = RestartableQueueListener(log_queue, logging.StreamHandler(stream))
+    logger = make_logger("tests.snapshot", log_queue)
+
+    state = {"a": 1}
+    logger.info("value %s", state)
+    state["a"] = 2
+
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue().strip() == "value {'a': 1}"
@@ -0,0 +1,101 @@
+# Metrics Tests
+# Histogram rendering, route labels and the /metrics endpoint
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from services import metrics as metrics_module
+from services import responses
+from services.metrics import Counter, Histogram, MetricsMiddleware, MetricsRegistry, TimedRoute
+from services.responses import FastJSONResponse
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """A fresh registry wherever the module-level one is used"""
+    import main
+
+    fresh = MetricsRegistry()
+    for module in (metrics_module, responses, main):
+        monkeypatch.setattr(module, "metrics", fresh)
+    return fresh
+
+
+@pytest.fixture
+def client(registry):
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    @router.get("/fast/{item_id}")
+    async def get_fast(item_id: str):
+        return FastJSONResponse({"id": item_id, "values": list(range(100))})
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(MetricsMiddleware)
+    return TestClient(app)
+
+
+def stage_count(registry, stage):
+    series = registry.stage_duration.series.get((stage,))
+    return sum(series[0]) if series else 0
+
+
+def test_histogram_places_values_in_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3.0, "/a")
+
+    assert histogram.series[("/a",)][0] == [2, 1, 1]
+    assert histogram.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_counter_renders_labels():
+    counter = Counter("lookups_total", "Lookups", ("result",))
+    counter.inc("hit")
+    counter.inc("hit", amount=2)
+
+    assert counter.render().splitlines()[-1] == 'lookups_total{result="hit"} 3'
+
+
+def test_middleware_labels_route_template_and_unmatched(client, registry):
+    assert client.get("/api/items/42").status_code == 200
+    assert client.get("/nowhere").status_code == 404
+
+    series = registry.http_request_duration.series
+    assert ("GET", "/api/items/{item_id}", "200") in series
+    assert ("GET", "unmatched", "404") in series
+    assert stage_count(registry, "serialization") == 1
+
+
+def test_fast_json_response_times_its_own_render(client, registry):
+    assert client.get("/api/fast/1").status_code == 200
+
+    # Recorded once, by the render itself, not again after the endpoint returns
+    assert stage_count(registry, "serialization") == 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text(registry):
+    import main
+
+    registry.cache_lookups.inc("metar", "hit")
+    response = TestClient(main.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'weather_cache_lookups_total{product="metar",result="hit"} 1' in response.text
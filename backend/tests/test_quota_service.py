@@ -0,0 +1,129 @@
+# Quota Service Tests
+# Sliding-window counters, refunds, persistence and Redis sync
+
+import asyncio
+import json
+import time
+
+from services.quota_service import QuotaService, SlidingWindowCounter
+
+WINDOW = 100
+
+
+def test_counter_weights_previous_window_by_overlap():
+    counter = SlidingWindowCounter(window=3, current=4)
+
+    # A quarter into window 4: three quarters of window 3 still overlap
+    assert counter.count(425, WINDOW) == 3
+    counter.hit()
+    assert counter.window == 4
+    assert counter.previous == 4
+    assert counter.count(425, WINDOW) == 4
+
+
+def test_counter_forgets_windows_it_skipped():
+    counter = SlidingWindowCounter(window=3, current=4, previous=2)
+
+    assert counter.count(550, WINDOW) == 0
+    assert (counter.window, counter.current, counter.previous) == (5, 0, 0)
+
+
+def test_refund_returns_the_query(tmp_path):
+    service = QuotaService(store_path=str(tmp_path / "usage.json"))
+    service.consume("user")
+    service.consume("user")
+
+    service.refund("user")
+
+    assert service.get_usage("user")["queries_this_month"] == 1
+    assert service.counters["user"].pending == 1
+
+
+def test_refund_without_usage_is_ignored(tmp_path):
+    service = QuotaService(store_path=str(tmp_path / "usage.json"))
+
+    service.refund("nobody")
+
+    assert "nobody" not in service.counters
+
+
+def test_usage_survives_reload_from_store(tmp_path):
+    store_path = str(tmp_path / "usage.json")
+    service = QuotaService(store_path=store_path)
+    service.set_tier("pilot", "pro")
+    for _ in range(3):
+        service.consume("pilot")
+    asyncio.run(service.flush())
+
+    reloaded = QuotaService(store_path=store_path)
+    reloaded._load()
+
+    usage = reloaded.get_usage("pilot")
+    assert usage["subscription_tier"] == "pro"
+    assert usage["queries_this_month"] == 3
+
+
+def test_flush_prunes_expired_counters(tmp_path):
+    store_path = tmp_path / "usage.json"
+    service = QuotaService(store_path=str(store_path), window_seconds=WINDOW)
+    current_window = int(time.time() // WINDOW)
+    service.counters["ip:old"] = SlidingWindowCounter(window=current_window - 2, current=5)
+    service.counters["ip:recent"] = SlidingWindowCounter(window=current_window - 1, current=5)
+    service.tiers["ip:old"] = "free"
+    service.consume("ip:new")
+
+    asyncio.run(service.flush())
+
+    assert set(service.counters) == {"ip:recent", "ip:new"}
+    assert "ip:old" not in service.tiers
+    assert set(json.loads(store_path.read_text())) == {"ip:recent", "ip:new"}
+
+
+class FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def incrby(self, key, delta):
+        self.ops.append(("incrby", key, delta))
+
+    def expire(self, key, seconds):
+        self.ops.append(("expire", key, seconds))
+
+    def get(self, key):
+        self.ops.append(("get", key))
+
+    async def execute(self):
+        results = []
+        for op, key, *args in self.ops:
+            if op == "incrby":
+                self.store[key] = self.store.get(key, 0) + args[0]
+                results.append(self.store[key])
+            elif op == "expire":
+                results.append(True)
+            else:
+                results.append(self.store.get(key))
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self):
+        return FakePipeline(self.store)
+
+
+def test_redis_sync_adopts_shared_totals(tmp_path):
+    service = QuotaService(store_path=str(tmp_path / "usage.json"))
+    service._redis = FakeRedis()
+    service.consume("pilot")
+    window = service.counters["pilot"].window
+    # Another instance already served two queries this window and one last window
+    service._redis.store[f"ai_quota:pilot:{window}"] = 2
+    service._redis.store[f"ai_quota:pilot:{window - 1}"] = 1
+
+    asyncio.run(service._sync_redis({"pilot"}))
+
+    counter = service.counters["pilot"]
+    assert (counter.current, counter.previous, counter.pending) == (3, 1, 0)
@@ -0,0 +1,87 @@
+# Response Tests
+# Accept-Encoding negotiation and compression middleware
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services import responses
+from services.responses import CompressionMiddleware, FastJSONResponse, _choose_encoding
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    """Behave as if brotli is installed, whether or not it is"""
+    monkeypatch.setattr(responses, "brotli", responses.brotli or object())
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("gzip;q=1, br;q=0.1", "gzip"),
+    ("br;q=0.5, *;q=0.8", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("*;q=0.5, br;q=0, gzip;q=0", None),
+    ("*;q=0", None),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("deflate, gzip;q=0.0", None),
+])
+def test_choose_encoding(with_brotli, header, expected):
+    assert _choose_encoding(header) == expected
+
+
+def test_choose_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    assert _choose_encoding("br, gzip") == "gzip"
+    assert _choose_encoding("*") == "gzip"
+    assert _choose_encoding("br") is None
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return FastJSONResponse({"values": list(range(2000))})
+
+    @app.get("/small")
+    async def small():
+        return FastJSONResponse({"ok": True})
+
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def test_large_response_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["values"][-1] == 1999
+
+
+def test_refused_encoding_is_not_used(client):
+    response = client.get("/large", headers={"Accept-Encoding": "*, br;q=0, gzip;q=0"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_gzip_body_round_trips():
+    body = FastJSONResponse({"values": list(range(2000))}).body
+
+    assert gzip.decompress(responses._compress(body, "gzip")) == body
@@ -0,0 +1,113 @@
+# Station Index Tests
+# KD-tree queries against brute force, and loading station lists
+
+import json
+import math
+import random
+
+import pytest
+
+from services.station_index import EARTH_RADIUS_NM, StationIndex
+
+
+def haversine_nm(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlmb = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(math.sqrt(a))
+
+
+@pytest.fixture(scope="module")
+def stations():
+    rng = random.Random(11)
+    return [
+        {"icao": f"K{i:03d}", "name": f"Station {i}",
+         "lat": rng.uniform(-89, 89), "lon": rng.uniform(-180, 180)}
+        for i in range(3000)
+    ]
+
+
+@pytest.fixture(scope="module")
+def index(stations):
+    return StationIndex(stations)
+
+
+def brute_force(stations, lat, lon):
+    return sorted((haversine_nm(lat, lon, s["lat"], s["lon"]), s["icao"]) for s in stations)
+
+
+def queries(count=50):
+    rng = random.Random(5)
+    return [(rng.uniform(-89, 89), rng.uniform(-180, 180)) for _ in range(count)]
+
+
+def test_nearest_matches_brute_force(stations, index):
+    for lat, lon in queries():
+        expected = brute_force(stations, lat, lon)[:5]
+        found = index.nearest(lat, lon, k=5)
+
+        assert [s["icao"] for s in found] == [icao for _, icao in expected]
+        for station, (distance, _) in zip(found, expected):
+            assert station["distance_nm"] == pytest.approx(distance, abs=0.1)
+
+
+def test_nearest_respects_max_distance(stations, index):
+    for lat, lon in queries():
+        expected = [icao for distance, icao in brute_force(stations, lat, lon)[:10] if distance <= 150]
+
+        found = index.nearest(lat, lon, k=10, max_distance_nm=150)
+
+        assert [s["icao"] for s in found] == expected
+
+
+def test_within_radius_matches_brute_force(stations, index):
+    for lat, lon in queries():
+        expected = [icao for distance, icao in brute_force(stations, lat, lon) if distance <= 400]
+
+        found = index.within_radius(lat, lon, 400)
+
+        assert [s["icao"] for s in found] == expected
+
+
+def test_empty_index_returns_nothing():
+    index = StationIndex([])
+
+    assert index.nearest(30.0, -97.0) == []
+    assert index.within_radius(30.0, -97.0, 100) == []
+
+
+def test_from_file_reads_csv_and_skips_bad_rows(tmp_path):
+    path = tmp_path / "stations.csv"
+    path.write_text(
+        "icao,name,lat,lon\n"
+        "kaus,Austin-Bergstrom Intl,30.1945,-97.6699\n"
+        "KBAD,No coordinates,,\n"
+        ",No identifier,30.0,-97.0\n"
+    )
+
+    index = StationIndex.from_file(str(path))
+
+    assert index.stations == [{"icao": "KAUS", "name": "Austin-Bergstrom Intl", "lat": 30.1945, "lon": -97.6699}]
+
+
+def test_from_file_reads_aviationweather_json(tmp_path):
+    path = tmp_path / "stations.json"
+    path.write_text(json.dumps([{"icaoId": "KSAT", "site": "San Antonio Intl", "lat": 29.5337, "lon": -98.4698}]))
+
+    index = StationIndex.from_file(str(path))
+
+    assert index.nearest(29.5, -98.5, k=1)[0]["name"] == "San Antonio Intl"
+
+
+def test_from_file_defaults_to_bundled_list(monkeypatch):
+    monkeypatch.delenv("WEATHER_STATIONS_PATH", raising=False)
+
+    index = StationIndex.from_file()
+
+    assert index.nearest(30.1945, -97.6699, k=1)[0]["icao"] == "KAUS"
+
+
+def test_missing_file_gives_empty_index(tmp_path):
+    index = StationIndex.from_file(str(tmp_path / "missing.csv"))
+
+    assert index.stations == []
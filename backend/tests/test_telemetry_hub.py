@@ -0,0 +1,38 @@
+# Telemetry Hub Tests
+# Viewer fan-out when a peer disappears mid-send
+
+import asyncio
+
+from services.telemetry_hub import TelemetryHub
+
+
+class VanishedSocket:
+    """WebSocket whose peer is gone: every send fails"""
+
+    def __init__(self):
+        self.closed_with = None
+
+    async def send_text(self, text):
+        raise ConnectionResetError("peer went away")
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_failed_send_unsubscribes_and_closes():
+    async def scenario():
+        hub = TelemetryHub()
+        websocket = VanishedSocket()
+        subscriber = hub.subscribe("flight", websocket)
+        task = subscriber.start()
+
+        hub.publish("flight", {"type": "sample"})
+        await asyncio.wait_for(task, timeout=1)
+        return hub, websocket, task
+
+    hub, websocket, task = asyncio.run(scenario())
+
+    assert task.exception() is None
+    assert hub.viewer_count("flight") == 0
+    assert websocket.closed_with == 1011
+    assert hub.publish("flight", {"type": "sample"}) == 0
@@ -0,0 +1,22 @@
+# Weather Service Tests
+# Batched METAR lookups served from the cache
+
+import asyncio
+import logging
+from datetime import datetime
+
+from services.weather_service import WeatherService
+
+
+def test_batched_cache_hits_are_tagged_for_sampling(caplog):
+    service = WeatherService()
+    for code in ("KAUS", "KSAT"):
+        service.cache[f"metar_{code}"] = (f"{code} 151853Z 18008KT 10SM FEW045 28/16 A3001", datetime.now())
+
+    with caplog.at_level(logging.INFO, logger="services.weather_service"):
+        metars = asyncio.run(service.get_metars(["KAUS", "KSAT"]))
+
+    assert metars["KAUS"].startswith("KAUS")
+    assert metars["KSAT"].startswith("KSAT")
+    hits = [record for record in caplog.records if getattr(record, "log_type", None) == "weather_cache_hit"]
+    assert len(hits) == 1